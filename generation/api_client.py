@@ -64,6 +64,8 @@ class LLMClient:
             config: LLM configuration.
         """
         self.config = config
+        # Reuse connections (and TLS sessions) across questions in one process
+        self._session = requests.Session()
 
     def _create_hmac_signature(
         self,
@@ -160,7 +162,7 @@ class LLMClient:
         url = f"{self.config.base_url}/chat/completions"
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 url,
                 headers=headers,
                 json=request_body,
@@ -46,6 +46,8 @@ class OllamaClient:
             config: Ollama configuration. If None, loads from environment.
         """
         self.config = config or OllamaConfig.from_env()
+        # Reuse connections to the Ollama server across questions
+        self._session = requests.Session()
 
     def chat(
         self,
@@ -83,7 +85,7 @@ class OllamaClient:
         }
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 url,
                 json=request_body,
                 timeout=self.config.timeout,
@@ -160,7 +162,7 @@ class OllamaClient:
             True if Ollama is available, False otherwise.
         """
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.config.base_url}/api/tags",
                 timeout=5,
             )
@@ -178,7 +180,7 @@ class OllamaClient:
             LLMClientError: If the request fails.
         """
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.config.base_url}/api/tags",
                 timeout=10,
             )
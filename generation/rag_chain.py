@@ -7,10 +7,9 @@ from pathlib import Path
 from typing import Optional
 
 import chromadb
-from chromadb.utils import embedding_functions
 
 from .base import BaseLLMClient
-from indexing.embeddings import get_model_path
+from indexing.embeddings import build_embedding_function
 
 
 DEFAULT_SYSTEM_PROMPT = """You are a helpful assistant that answers questions based on the provided context.
@@ -52,10 +51,12 @@ class RAGConfig:
     vectorstore_dir: Path = field(default_factory=lambda: Path("data/vectorstore"))
     collection_name: str = "pilot-docs"
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_backend: str = "torch"
     top_k: int = 5
     max_tokens: int = 1000
     temperature: float = 0.7
     system_prompt: str = DEFAULT_SYSTEM_PROMPT
+    daemon_socket: Optional[Path] = None
 
 
 class RAGChain:
@@ -77,6 +78,7 @@ class RAGChain:
         self.config = config or RAGConfig()
         self._collection = None
         self._chroma_client = None
+        self._embedding_fn = None
 
     def _get_collection(self):
         """Get or initialize the Chroma collection."""
@@ -84,17 +86,23 @@ class RAGChain:
             self._chroma_client = chromadb.PersistentClient(
                 path=str(self.config.vectorstore_dir)
             )
-            # Resolve model path (prefers local model if available)
-            resolved_model = get_model_path(self.config.embedding_model)
-            embedding_fn = embedding_functions.SentenceTransformerEmbeddingFunction(
-                model_name=resolved_model,
-            )
+            # Queries are embedded by _embed_query, so the collection needs no
+            # embedding function of its own.
             self._collection = self._chroma_client.get_collection(
                 self.config.collection_name,
-                embedding_function=embedding_fn,
+                embedding_function=None,
             )
         return self._collection
 
+    def _embed_query(self, query: str):
+        """Embed a query with the configured model, loading it on first use."""
+        if self._embedding_fn is None:
+            self._embedding_fn = build_embedding_function(
+                self.config.embedding_model,
+                backend=self.config.embedding_backend,
+            )
+        return self._embedding_fn([query])
+
     def retrieve(self, query: str, k: Optional[int] = None) -> RetrievalResult:
         """Retrieve relevant chunks for a query.
 
@@ -105,12 +113,34 @@ class RAGChain:
         Returns:
             Retrieved chunks with metadata.
         """
-        collection = self._get_collection()
         n_results = k or self.config.top_k
 
+        if self.config.daemon_socket is not None:
+            # Imported only when a daemon is configured, so retrieval does
+            # not depend on unix socket support
+            from indexing.query_daemon import query_daemon
+
+            result = query_daemon(
+                self.config.daemon_socket,
+                query,
+                n_results,
+                collection_name=self.config.collection_name,
+                vectorstore_dir=self.config.vectorstore_dir,
+                embedding_model=self.config.embedding_model,
+                embedding_backend=self.config.embedding_backend,
+            )
+            return RetrievalResult(
+                chunks=result["documents"],
+                metadatas=result["metadatas"],
+                distances=result["distances"],
+                ids=result["ids"],
+            )
+
+        collection = self._get_collection()
         result = collection.query(
-            query_texts=[query],
+            query_embeddings=self._embed_query(query),
             n_results=n_results,
+            include=["documents", "metadatas", "distances"],
         )
 
         documents = result.get("documents", [[]])[0]
@@ -3,6 +3,7 @@
 from .embeddings import (
     DEFAULT_DIMENSIONS,
     DEFAULT_MODEL,
+    EMBEDDING_BACKENDS,
     EmbeddingConfig,
     EmbeddingError,
     EmbeddingService,
@@ -20,4 +21,5 @@ __all__ = [
     "build_embedding_function",
     "DEFAULT_MODEL",
     "DEFAULT_DIMENSIONS",
+    "EMBEDDING_BACKENDS",
 ]
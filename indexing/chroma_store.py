@@ -103,6 +103,9 @@ def get_collection(
     persist_path: Path,
     collection_name: str,
     embedding_function: Optional[object] = None,
+    hnsw_m: Optional[int] = None,
+    hnsw_construction_ef: Optional[int] = None,
+    hnsw_search_ef: Optional[int] = None,
 ) -> Collection:
     """Get or create a Chroma collection.
 
@@ -111,15 +114,66 @@ def get_collection(
         collection_name: Name of the collection.
         embedding_function: Optional embedding function. If None, embeddings
             must be provided explicitly during upsert operations.
+        hnsw_m: HNSW graph degree (``hnsw:M``); Chroma's default when None.
+        hnsw_construction_ef: Candidate list size while building the index.
+        hnsw_search_ef: Candidate list size while querying. Unlike the build
+            parameters, it is also applied to an existing collection.
 
     Returns:
         Chroma collection instance.
     """
     persist_path.mkdir(parents=True, exist_ok=True)
     client = chromadb.PersistentClient(path=str(persist_path))
+    metadata = {"hnsw:space": "cosine"}
+    for key, value in (
+        ("hnsw:M", hnsw_m),
+        ("hnsw:construction_ef", hnsw_construction_ef),
+        ("hnsw:search_ef", hnsw_search_ef),
+    ):
+        if value is not None:
+            metadata[key] = value
     collection = client.get_or_create_collection(
         name=collection_name,
-        metadata={"hnsw:space": "cosine"},
+        metadata=metadata,
         embedding_function=embedding_function,
     )
+
+    if hnsw_m is None and hnsw_construction_ef is None and hnsw_search_ef is None:
+        return collection
+
+    # Build parameters are fixed once the collection exists; search_ef is not
+    current = _hnsw_settings(collection)
+    for key in ("hnsw:M", "hnsw:construction_ef"):
+        if key in metadata and current.get(key) not in (None, metadata[key]):
+            logger.warning(
+                "Collection %s already uses %s=%s; recreate it to apply %s.",
+                collection_name,
+                key,
+                current[key],
+                metadata[key],
+            )
+    if hnsw_search_ef is not None and current.get("hnsw:search_ef") != hnsw_search_ef:
+        if getattr(collection, "configuration", None) is not None:
+            collection.modify(configuration={"hnsw": {"ef_search": hnsw_search_ef}})
+        else:
+            collection.modify(
+                metadata={**(collection.metadata or {}), "hnsw:search_ef": hnsw_search_ef}
+            )
     return collection
+
+
+def _hnsw_settings(collection: Collection) -> dict:
+    """Return a collection's HNSW parameters keyed by their ``hnsw:*`` metadata names.
+
+    chromadb 1.x reports them in ``collection.configuration``; older releases
+    only have the collection metadata.
+    """
+    configuration = getattr(collection, "configuration", None)
+    if configuration is None:
+        return dict(collection.metadata or {})
+    hnsw_config = configuration.get("hnsw") or {}
+    return {
+        "hnsw:M": hnsw_config.get("max_neighbors"),
+        "hnsw:construction_ef": hnsw_config.get("ef_construction"),
+        "hnsw:search_ef": hnsw_config.get("ef_search"),
+    }
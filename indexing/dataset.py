@@ -7,9 +7,21 @@ from typing import Dict, Iterable, Iterator, Optional, Sequence
 
 from .models import ChunkRecord
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _loads(data: bytes) -> object:
+    """Parse UTF-8 JSON bytes, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def _sanitize_metadata(metadata: Dict[str, object]) -> Dict[str, object]:
     """Ensure metadata values are compatible with Chroma's type constraints.
 
@@ -31,7 +43,7 @@ def _sanitize_metadata(metadata: Dict[str, object]) -> Dict[str, object]:
 def load_manifest(manifest_path: Path) -> Dict[str, Dict]:
     if not manifest_path.exists():
         raise FileNotFoundError(f"Manifest not found at {manifest_path}")
-    return json.loads(manifest_path.read_text(encoding="utf-8"))
+    return _loads(manifest_path.read_bytes())
 
 
 def iter_chunk_records(
@@ -51,12 +63,13 @@ def iter_chunk_records(
             logger.warning("Chunk file %s missing, skipping.", chunk_path)
             continue
 
-        with chunk_path.open("r", encoding="utf-8") as fp:
+        # Lines are parsed straight from bytes, skipping a str decode per line
+        with chunk_path.open("rb") as fp:
             for line in fp:
                 line = line.strip()
                 if not line:
                     continue
-                chunk_data = json.loads(line)
+                chunk_data = _loads(line)
 
                 # Get document-level metadata
                 doc_metadata = doc_entry.get("metadata", {})
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
+import platform
+import random
+import sqlite3
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from chromadb.utils import embedding_functions
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +27,10 @@ DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 DEFAULT_LOCAL_MODEL = "models/sentence-transformers_all-MiniLM-L6-v2"
 DEFAULT_DIMENSIONS = 384
 
+# Inference backends for query-time embedding. "onnx-int8" loads the dynamically
+# quantized ONNX weights published alongside sentence-transformers models.
+EMBEDDING_BACKENDS = ("torch", "onnx", "onnx-int8")
+
 
 def get_model_path(model_name: str) -> str:
     """Resolve model path, preferring local models if available.
@@ -65,9 +74,68 @@ class EmbeddingConfig:
     """Configuration for embedding generation."""
 
     model_name: str = DEFAULT_MODEL
+    # One of EMBEDDING_BACKENDS; "onnx-int8" runs quantized weights on ONNX Runtime
+    backend: str = "torch"
+    # Torch device for inference, e.g. "cuda" on machines with a GPU
+    device: str = "cpu"
     max_retries: int = 3
     retry_delay: float = 1.0
     retry_backoff: float = 2.0
+    # Directory for a persistent embedding cache keyed by model and text; None disables it
+    cache_dir: Optional[Path] = None
+
+
+class EmbeddingCache:
+    """SQLite store of embeddings keyed by a hash of the model and the text.
+
+    Lets identical texts skip the model across runs, e.g. when a chunker
+    change shifts chunk ids without changing most chunk texts.
+    """
+
+    # Stay below SQLite's bound-parameter limit on older builds
+    _LOOKUP_BATCH = 500
+
+    def __init__(self, cache_dir: Path, model_key: str):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.model_key = model_key
+        self._conn = sqlite3.connect(str(cache_dir / "embeddings.sqlite"))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+
+    def key(self, text: str) -> bytes:
+        """Return the cache key for ``text`` under this cache's model."""
+        return hashlib.sha256(f"{self.model_key}\0{text}".encode("utf-8")).digest()
+
+    def get_many(self, keys: Sequence[bytes]) -> Dict[bytes, np.ndarray]:
+        """Return the cached vectors for whichever of ``keys`` are present."""
+        found: Dict[bytes, np.ndarray] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        for start in range(0, len(unique_keys), self._LOOKUP_BATCH):
+            batch = unique_keys[start : start + self._LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, vec FROM embeddings WHERE key IN ({placeholders})", batch
+            )
+            for key, vec in rows:
+                found[key] = np.frombuffer(vec, dtype=np.float32)
+        return found
+
+    def put_many(self, items: Dict[bytes, Sequence[float]]) -> None:
+        """Store vectors as float32 bytes, keeping any existing entry."""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vec) VALUES (?, ?)",
+                [
+                    (key, np.asarray(vec, dtype=np.float32).tobytes())
+                    for key, vec in items.items()
+                ],
+            )
+
+    def close(self) -> None:
+        self._conn.close()
 
 
 class EmbeddingService:
@@ -77,6 +145,12 @@ class EmbeddingService:
         self.config = config or EmbeddingConfig()
         self._embedding_fn = None
         self._model_loaded = False
+        self._cache: Optional[EmbeddingCache] = None
+        if self.config.cache_dir is not None:
+            self._cache = EmbeddingCache(
+                Path(self.config.cache_dir),
+                f"{self.config.model_name}[{self.config.backend}]",
+            )
 
     @property
     def dimensions(self) -> int:
@@ -87,11 +161,17 @@ class EmbeddingService:
     def embedding_function(self):
         """Lazy-load the embedding function."""
         if self._embedding_fn is None:
-            self._embedding_fn = build_embedding_function(self.config.model_name)
+            self._embedding_fn = build_embedding_function(
+                self.config.model_name,
+                backend=self.config.backend,
+                device=self.config.device,
+            )
             self._model_loaded = True
             logger.info(
-                "Loaded embedding model: %s (dimensions=%d)",
+                "Loaded embedding model: %s (backend=%s, device=%s, dimensions=%d)",
                 self.config.model_name,
+                self.config.backend,
+                self.config.device,
                 self.dimensions,
             )
         return self._embedding_fn
@@ -99,6 +179,9 @@ class EmbeddingService:
     def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for a batch of texts with retry logic.
 
+        With a ``cache_dir`` configured, only texts missing from the cache
+        are sent to the model.
+
         Args:
             texts: List of text strings to embed.
 
@@ -110,7 +193,21 @@ class EmbeddingService:
         """
         if not texts:
             return []
-
+        if self._cache is None:
+            return self._embed_with_retries(texts)
+
+        keys = [self._cache.key(text) for text in texts]
+        vectors = self._cache.get_many(keys)
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if missing:
+            computed = dict(zip(missing, self._embed_with_retries(list(missing.values()))))
+            self._cache.put_many(computed)
+            vectors.update(computed)
+        logger.debug("Embedding cache: %d hits, %d misses.", len(texts) - len(missing), len(missing))
+        return [vectors[key] for key in keys]
+
+    def _embed_with_retries(self, texts: List[str]) -> List[List[float]]:
+        """Call the embedding function, retrying with exponential backoff."""
         last_error: Optional[Exception] = None
         delay = self.config.retry_delay
 
@@ -127,14 +224,16 @@ class EmbeddingService:
             except Exception as exc:
                 last_error = exc
                 if attempt < self.config.max_retries:
+                    # Jitter keeps concurrent callers from retrying in lockstep
+                    wait = delay * (0.5 + random.random())
                     logger.warning(
                         "Embedding attempt %d/%d failed: %s. Retrying in %.1fs...",
                         attempt,
                         self.config.max_retries,
                         exc,
-                        delay,
+                        wait,
                     )
-                    time.sleep(delay)
+                    time.sleep(wait)
                     delay *= self.config.retry_backoff
                 else:
                     logger.error(
@@ -148,12 +247,76 @@ class EmbeddingService:
         ) from last_error
 
 
-def build_embedding_function(model_name: str):
-    """Create a SentenceTransformer embedding function for Chroma.
+def _quantized_onnx_file() -> str:
+    """Return the quantized ONNX weights file suited to this CPU architecture."""
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "onnx/model_qint8_arm64.onnx"
+    return "onnx/model_quint8_avx2.onnx"
+
 
-    Automatically resolves to local model if available in models/ directory.
+def build_embedding_function(model_name: str, backend: str = "torch", device: str = "cpu"):
+    """Create a SentenceTransformer embedding function.
+
+    Automatically resolves to local model if available in models/ directory,
+    unless an ONNX backend needs weights that local copy does not have.
+    ``backend`` selects PyTorch (default), ONNX Runtime, or ONNX Runtime with
+    int8-quantized weights; the ONNX backends need ``sentence-transformers[onnx]>=3.2``.
+    ``device`` is passed to SentenceTransformer, e.g. ``"cuda"`` to embed on a GPU.
     """
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(
+            f"Unknown embedding backend '{backend}'. Options: {', '.join(EMBEDDING_BACKENDS)}"
+        )
     resolved_path = get_model_path(model_name)
-    return embedding_functions.SentenceTransformerEmbeddingFunction(
-        model_name=resolved_path,
+    if backend == "torch":
+        return SentenceTransformerFunction(_load_sentence_transformer(resolved_path, device))
+    onnx_file = "onnx/model.onnx"
+    if backend == "onnx-int8":
+        onnx_file = _quantized_onnx_file()
+    # Local copies saved by download_model.py carry no ONNX exports; load
+    # those from the hub repo instead
+    if (
+        resolved_path != model_name
+        and Path(resolved_path).is_dir()
+        and not (Path(resolved_path) / onnx_file).exists()
+    ):
+        logger.info("Local model %s has no %s; using %s", resolved_path, onnx_file, model_name)
+        resolved_path = model_name
+    return SentenceTransformerFunction(
+        _load_sentence_transformer(resolved_path, device, onnx_file=onnx_file)
     )
+
+
+class SentenceTransformerFunction:
+    """Chroma-style embedding function around one loaded SentenceTransformer."""
+
+    def __init__(self, model):
+        self.model = model
+
+    def __call__(self, input: Sequence[str]) -> List[np.ndarray]:
+        return list(self.model.encode(list(input), convert_to_numpy=True))
+
+
+# Models loaded by _load_sentence_transformer, keyed by path, device and ONNX file
+_LOADED_MODELS: Dict[Tuple[str, str, Optional[str]], object] = {}
+_LOADED_MODELS_LOCK = threading.Lock()
+
+
+def _load_sentence_transformer(model_path: str, device: str, onnx_file: Optional[str] = None):
+    """Load a SentenceTransformer once per process for each path, device and backend.
+
+    ``onnx_file`` selects the ONNX Runtime backend with that weights file;
+    None loads the PyTorch weights.
+    """
+    key = (model_path, device, onnx_file)
+    with _LOADED_MODELS_LOCK:
+        model = _LOADED_MODELS.get(key)
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+
+            backend_kwargs = {}
+            if onnx_file is not None:
+                backend_kwargs = {"backend": "onnx", "model_kwargs": {"file_name": onnx_file}}
+            model = SentenceTransformer(model_path, device=device, **backend_kwargs)
+            _LOADED_MODELS[key] = model
+    return model
@@ -1,19 +1,28 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 import random
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Sequence, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from chromadb.api.types import Documents, Embeddings, IDs, Metadatas
 
 from .chroma_store import get_collection
 from .dataset import iter_chunk_records, load_manifest
 from .embeddings import EmbeddingConfig, EmbeddingError, EmbeddingService
+from .models import ChunkRecord
 
 logger = logging.getLogger(__name__)
 
+# Upsert batches handed to the writer thread: their chunk ids and the pending upsert
+SubmittedUpserts = List[Tuple[IDs, Future]]
+
+# Documents whose stored chunk metadata is fetched with a single collection.get
+STORED_LOOKUP_DOCS = 64
+
 
 @dataclass
 class IndexingConfig:
@@ -21,8 +30,23 @@ class IndexingConfig:
     chroma_dir: Path
     collection_name: str = "pilot-docs"
     embedding_model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+    # Inference backend for chunk embeddings (see embeddings.EMBEDDING_BACKENDS);
+    # the ONNX backends need sentence-transformers[onnx]>=3.2
+    embedding_backend: str = "torch"
+    # Device used to embed chunks, e.g. "cuda"
+    embedding_device: str = "cpu"
+    # Persistent embedding cache keyed by model and chunk text; None disables it
+    embedding_cache_dir: Optional[Path] = None
     batch_size: int = 32
+    # Chunks embedded per model call; upserts are still sent in batch_size slices
+    encode_batch_size: int = 256
     doc_filter: Optional[Sequence[str]] = None
+    # Re-embed every chunk even when its stored chunk_hash still matches
+    force_reembed: bool = False
+    # HNSW index parameters; None keeps Chroma's defaults
+    hnsw_m: Optional[int] = None
+    hnsw_construction_ef: Optional[int] = None
+    hnsw_search_ef: Optional[int] = None
 
 
 # Required metadata fields for Chroma chunks (Issue #14)
@@ -54,6 +78,30 @@ class IndexingResult:
     skipped_docs: int
     failed_chunks: int = 0
     verification: MetadataVerificationResult = None
+    # Chunks that kept their stored embedding because their text was unchanged
+    reused_chunks: int = 0
+
+
+@dataclass
+class _DocumentWrites:
+    """Chroma writes submitted for one document and not yet waited on."""
+
+    doc_id: str
+    delete: Optional[Future]
+    upserts: SubmittedUpserts
+    embed_failures: int
+    # Chunks that kept their stored embedding; those needing no write at all
+    reused_chunks: int = 0
+    unwritten_chunks: int = 0
+
+
+def chunk_hash(text: str, model_name: str) -> str:
+    """Hash a chunk's text together with the model that embeds it.
+
+    Including the model name makes a model switch invalidate every stored
+    embedding, not just those whose text changed.
+    """
+    return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
 
 
 class ChromaIndexingPipeline:
@@ -61,7 +109,12 @@ class ChromaIndexingPipeline:
         self.config = config
 
         # Initialize embedding service with retry logic
-        embedding_config = EmbeddingConfig(model_name=config.embedding_model_name)
+        embedding_config = EmbeddingConfig(
+            model_name=config.embedding_model_name,
+            backend=config.embedding_backend,
+            device=config.embedding_device,
+            cache_dir=config.embedding_cache_dir,
+        )
         self.embedding_service = EmbeddingService(embedding_config)
 
         # Create collection without embedding function (we pre-compute embeddings)
@@ -69,6 +122,9 @@ class ChromaIndexingPipeline:
             config.chroma_dir,
             config.collection_name,
             embedding_function=None,
+            hnsw_m=config.hnsw_m,
+            hnsw_construction_ef=config.hnsw_construction_ef,
+            hnsw_search_ef=config.hnsw_search_ef,
         )
 
         self.manifest_path = config.processed_dir / "manifest.json"
@@ -86,93 +142,288 @@ class ChromaIndexingPipeline:
         else:
             doc_ids = sorted(available_doc_ids)
 
-        indexed_docs = 0
-        indexed_chunks = 0
         skipped_docs = 0
-        failed_chunks = 0
-
-        for doc_id in doc_ids:
-            records = list(iter_chunk_records(manifest, self.chunks_dir, [doc_id]))
-            if not records:
-                skipped_docs += 1
-                logger.warning("No chunk records found for %s; skipping.", doc_id)
-                continue
-
-            logger.info("Re-indexing %s (%d chunks).", doc_id, len(records))
-            self.collection.delete(where={"doc_id": doc_id})
-            success_count, fail_count = self._upsert_records(records)
-            indexed_docs += 1
-            indexed_chunks += success_count
-            failed_chunks += fail_count
-            if fail_count > 0:
-                logger.warning(
-                    "Indexed %s: %d chunks succeeded, %d failed (collection=%s).",
-                    doc_id,
-                    success_count,
-                    fail_count,
-                    self.config.collection_name,
-                )
-            else:
-                logger.info(
-                    "Indexed %s: %d chunks (collection=%s).",
-                    doc_id,
-                    success_count,
-                    self.config.collection_name,
+        finished: List[Tuple[int, int, int]] = []
+
+        # Chroma writes run on one background thread in submission order, so
+        # a document's delete still precedes its upserts, while the next
+        # document is embedded on this thread
+        with ThreadPoolExecutor(max_workers=1) as writer:
+            in_flight: Optional[_DocumentWrites] = None
+            stored_by_doc: Dict[str, Dict[str, dict]] = {}
+            for position, doc_id in enumerate(doc_ids):
+                if not self.config.force_reembed and position % STORED_LOOKUP_DOCS == 0:
+                    stored_by_doc = self._stored_metadatas(
+                        doc_ids[position : position + STORED_LOOKUP_DOCS]
+                    )
+                records = list(iter_chunk_records(manifest, self.chunks_dir, [doc_id]))
+                if not records:
+                    skipped_docs += 1
+                    logger.warning("No chunk records found for %s; skipping.", doc_id)
+                    continue
+
+                logger.info("Re-indexing %s (%d chunks).", doc_id, len(records))
+                writes = self._submit_document(
+                    doc_id, records, writer, stored_by_doc.get(doc_id, {})
                 )
+                if in_flight is not None:
+                    finished.append(self._finish_document(in_flight))
+                in_flight = writes
+            if in_flight is not None:
+                finished.append(self._finish_document(in_flight))
 
         return IndexingResult(
-            indexed_docs=indexed_docs,
-            indexed_chunks=indexed_chunks,
+            indexed_docs=len(finished),
+            indexed_chunks=sum(success_count for success_count, _, _ in finished),
             skipped_docs=skipped_docs,
-            failed_chunks=failed_chunks,
+            failed_chunks=sum(fail_count for _, fail_count, _ in finished),
+            reused_chunks=sum(reused_count for _, _, reused_count in finished),
+        )
+
+    def _submit_document(
+        self,
+        doc_id: str,
+        records: List[ChunkRecord],
+        writer: ThreadPoolExecutor,
+        stored: Dict[str, dict],
+    ) -> _DocumentWrites:
+        """Submit the Chroma writes that bring one document up to date.
+
+        Every record is tagged with a ``chunk_hash``. A chunk in ``stored``
+        (the document's current chunk metadata by id) with the same hash keeps
+        its embedding: it is left alone when its metadata is unchanged, or
+        re-upserted with the stored embedding otherwise. Only new or edited
+        chunks are embedded, and stored chunks the document no longer produces
+        are deleted. When nothing is stored, as with ``force_reembed``, the
+        document's chunks are deleted and all re-embedded.
+        """
+        model_name = self.config.embedding_model_name
+        if self.config.embedding_backend != "torch":
+            # Quantized or exported weights give different vectors than PyTorch
+            model_name = f"{model_name}[{self.config.embedding_backend}]"
+        for record in records:
+            record.metadata["chunk_hash"] = chunk_hash(record.text, model_name)
+
+        if not stored:
+            delete = writer.submit(self.collection.delete, where={"doc_id": doc_id})
+            embed_failures, upserts = self._submit_upserts(records, writer)
+            return _DocumentWrites(doc_id, delete, upserts, embed_failures)
+
+        changed: List[ChunkRecord] = []
+        refreshed: List[ChunkRecord] = []
+        for record in records:
+            stored_metadata = stored.get(record.chunk_id)
+            if (
+                stored_metadata is None
+                or stored_metadata.get("chunk_hash") != record.metadata["chunk_hash"]
+            ):
+                changed.append(record)
+            elif stored_metadata != record.metadata:
+                refreshed.append(record)
+
+        current_ids = {record.chunk_id for record in records}
+        stale_ids = [chunk_id for chunk_id in stored if chunk_id not in current_ids]
+        delete = writer.submit(self.collection.delete, ids=stale_ids) if stale_ids else None
+
+        refresh_upserts, unreadable = self._submit_metadata_refresh(refreshed, writer)
+        changed.extend(unreadable)
+        embed_failures, upserts = self._submit_upserts(changed, writer)
+        upserts.extend(refresh_upserts)
+        reused_chunks = len(records) - len(changed)
+        logger.debug(
+            "%s: %d chunks to embed, %d reused, %d stale.",
+            doc_id,
+            len(changed),
+            reused_chunks,
+            len(stale_ids),
         )
+        return _DocumentWrites(
+            doc_id,
+            delete,
+            upserts,
+            embed_failures,
+            reused_chunks=reused_chunks,
+            unwritten_chunks=reused_chunks - (len(refreshed) - len(unreadable)),
+        )
+
+    def _stored_metadatas(self, doc_ids: Sequence[str]) -> Dict[str, Dict[str, dict]]:
+        """Return the stored chunk metadata of ``doc_ids``, keyed by doc and chunk id.
 
-    def _upsert_records(self, records) -> Tuple[int, int]:
-        """Upsert records in batches with error handling.
+        One query covers all of ``doc_ids`` instead of a round trip per document.
+        """
+        stored = self.collection.get(
+            where={"doc_id": {"$in": list(doc_ids)}},
+            include=["metadatas"],
+        )
+        by_doc: Dict[str, Dict[str, dict]] = {}
+        for chunk_id, metadata in zip(stored.get("ids") or [], stored.get("metadatas") or []):
+            metadata = metadata or {}
+            by_doc.setdefault(metadata.get("doc_id"), {})[chunk_id] = metadata
+        return by_doc
 
-        Pre-computes embeddings using EmbeddingService with retry logic,
-        then upserts to Chroma.
+    def _submit_metadata_refresh(
+        self, records: List[ChunkRecord], writer: ThreadPoolExecutor
+    ) -> Tuple[SubmittedUpserts, List[ChunkRecord]]:
+        """Re-upsert unchanged chunks with new metadata and their stored embeddings.
 
         Returns:
-            Tuple of (success_count, fail_count).
+            Tuple of (submitted upserts, records to re-embed). A record is
+            re-embedded when its stored embedding cannot be read, e.g. after a
+            failed read or because the chunk was deleted in the meantime.
         """
         batch_size = max(1, self.config.batch_size)
-        success_count = 0
-        fail_count = 0
-
+        upserts: SubmittedUpserts = []
+        unreadable: List[ChunkRecord] = []
         for start in range(0, len(records), batch_size):
             batch = records[start : start + batch_size]
-            ids: IDs = [record.chunk_id for record in batch]
-            documents: Documents = [record.text for record in batch]
-            metadatas: Metadatas = [record.metadata for record in batch]
+            try:
+                stored = self.collection.get(
+                    ids=[record.chunk_id for record in batch], include=["embeddings"]
+                )
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.warning(
+                    "Reading %d stored embeddings failed, re-embedding them: %s",
+                    len(batch),
+                    exc,
+                )
+                unreadable.extend(batch)
+                continue
+            embeddings_by_id = dict(zip(stored["ids"], stored["embeddings"]))
+            readable = []
+            for record in batch:
+                if embeddings_by_id.get(record.chunk_id) is None:
+                    unreadable.append(record)
+                else:
+                    readable.append(record)
+            if not readable:
+                continue
+            ids: IDs = [record.chunk_id for record in readable]
+            upsert = writer.submit(
+                self.collection.upsert,
+                ids=ids,
+                documents=[record.text for record in readable],
+                metadatas=[record.metadata for record in readable],
+                embeddings=[embeddings_by_id[chunk_id] for chunk_id in ids],
+            )
+            upserts.append((ids, upsert))
+        return upserts, unreadable
+
+    def _finish_document(self, writes: _DocumentWrites) -> Tuple[int, int, int]:
+        """Wait for a document's writes and log the outcome.
+
+        Returns:
+            Tuple of (success_count, fail_count, reused_count). Reused chunks
+            that needed no write count as successes.
+        """
+        # A failed delete aborts the run, as it did when called inline
+        if writes.delete is not None:
+            writes.delete.result()
+        written_count, upsert_failures = self._collect_upserts(writes.upserts)
+        success_count = written_count + writes.unwritten_chunks
+        fail_count = writes.embed_failures + upsert_failures
+        if fail_count > 0:
+            logger.warning(
+                "Indexed %s: %d chunks succeeded, %d failed (collection=%s).",
+                writes.doc_id,
+                success_count,
+                fail_count,
+                self.config.collection_name,
+            )
+        else:
+            logger.info(
+                "Indexed %s: %d chunks, %d reused embeddings (collection=%s).",
+                writes.doc_id,
+                success_count,
+                writes.reused_chunks,
+                self.config.collection_name,
+            )
+        return success_count, fail_count, writes.reused_chunks
+
+    def _upsert_records(self, records: List[ChunkRecord]) -> Tuple[int, int]:
+        """Embed and upsert records, waiting for all writes to finish.
+
+        Returns:
+            Tuple of (success_count, fail_count).
+        """
+        with ThreadPoolExecutor(max_workers=1) as writer:
+            embed_failures, upserts = self._submit_upserts(records, writer)
+            success_count, upsert_failures = self._collect_upserts(upserts)
+        return success_count, embed_failures + upsert_failures
+
+    def _submit_upserts(
+        self, records: List[ChunkRecord], writer: ThreadPoolExecutor
+    ) -> Tuple[int, SubmittedUpserts]:
+        """Embed records and submit their upserts in batches to ``writer``.
+
+        Pre-computes embeddings using EmbeddingService with retry logic.
+        Embeddings are computed for up to ``encode_batch_size`` records per
+        call: SentenceTransformer sorts each call's texts by length before
+        forming its mini-batches, so larger calls waste less compute on
+        padding for mixed-length chunks. Each upsert of ``batch_size`` records
+        is submitted as soon as its group is embedded, so it overlaps with
+        embedding the next group.
+
+        Returns:
+            Tuple of (records that failed to embed, submitted upserts).
+        """
+        batch_size = max(1, self.config.batch_size)
+        encode_batch_size = max(batch_size, self.config.encode_batch_size)
+        embed_failures = 0
+        upserts: SubmittedUpserts = []
+
+        for group_start in range(0, len(records), encode_batch_size):
+            group = records[group_start : group_start + encode_batch_size]
 
             try:
-                # Pre-compute embeddings with retry logic
-                embeddings: Embeddings = self.embedding_service.embed_batch(documents)
-                self.collection.upsert(
-                    ids=ids,
-                    documents=documents,
-                    metadatas=metadatas,
-                    embeddings=embeddings,
+                group_embeddings: Embeddings = self.embedding_service.embed_batch(
+                    [record.text for record in group]
                 )
-                success_count += len(batch)
             except EmbeddingError as exc:
-                fail_count += len(batch)
+                embed_failures += len(group)
                 logger.error(
                     "Failed to embed batch of %d chunks (ids=%s...): %s",
-                    len(batch),
-                    ids[0] if ids else "none",
+                    len(group),
+                    group[0].chunk_id,
                     exc,
                 )
+                continue
+
+            for start in range(0, len(group), batch_size):
+                batch = group[start : start + batch_size]
+                ids: IDs = [record.chunk_id for record in batch]
+                documents: Documents = [record.text for record in batch]
+                metadatas: Metadatas = [record.metadata for record in batch]
+                upsert = writer.submit(
+                    self.collection.upsert,
+                    ids=ids,
+                    documents=documents,
+                    metadatas=metadatas,
+                    embeddings=group_embeddings[start : start + batch_size],
+                )
+                upserts.append((ids, upsert))
+
+        return embed_failures, upserts
+
+    def _collect_upserts(self, upserts: SubmittedUpserts) -> Tuple[int, int]:
+        """Wait for submitted upserts.
+
+        Returns:
+            Tuple of (success_count, fail_count).
+        """
+        success_count = 0
+        fail_count = 0
+        for ids, upsert in upserts:
+            try:
+                upsert.result()
+                success_count += len(ids)
             except Exception as exc:
-                fail_count += len(batch)
+                fail_count += len(ids)
                 logger.error(
                     "Failed to upsert batch of %d chunks (ids=%s...): %s",
-                    len(batch),
+                    len(ids),
                     ids[0] if ids else "none",
                     exc,
                 )
-
         return success_count, fail_count
 
     def verify_metadata(self, sample_size: int = 100) -> MetadataVerificationResult:
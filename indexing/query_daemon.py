@@ -0,0 +1,251 @@
+"""Resident query daemon that keeps the embedding model and Chroma client warm.
+
+Single-question CLI runs spend most of their time loading the SentenceTransformer
+weights. The daemon loads them once and answers retrieval requests over a unix
+socket using one JSON line per request and one JSON line per response.
+Platforms without unix sockets, such as Windows, get no server class and
+clients raise QueryDaemonError.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import chromadb
+
+from .embeddings import build_embedding_function
+
+logger = logging.getLogger(__name__)
+
+DAEMON_SOCKET_ENV = "RAG_DAEMON_SOCKET"
+
+# Unix sockets are unavailable on some platforms, e.g. Windows
+DAEMON_SUPPORTED = hasattr(socket, "AF_UNIX")
+
+
+class QueryDaemonError(Exception):
+    """Raised when the query daemon cannot be reached or rejects a request."""
+
+
+def daemon_socket_from_env() -> Optional[Path]:
+    """Return the daemon socket path configured via RAG_DAEMON_SOCKET, if any."""
+    value = os.getenv(DAEMON_SOCKET_ENV)
+    return Path(value) if value else None
+
+
+def query_daemon(
+    socket_path: Union[str, Path],
+    question: str,
+    k: int,
+    collection_name: Optional[str] = None,
+    timeout: float = 30.0,
+    vectorstore_dir: Optional[Path] = None,
+    embedding_model: Optional[str] = None,
+    embedding_backend: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Send a retrieval request to a running daemon.
+
+    The collection, vector store and embedding settings the caller expects
+    are sent along, and the daemon refuses the request if it serves
+    different ones rather than answering from another index.
+
+    Returns:
+        Chroma-style query result with ``ids``, ``documents``, ``metadatas``
+        and ``distances`` for the single question.
+
+    Raises:
+        QueryDaemonError: If the daemon is unreachable or reports an error.
+    """
+    if not DAEMON_SUPPORTED:
+        raise QueryDaemonError("The query daemon needs unix sockets, which this platform lacks")
+    request = {"question": question, "k": k}
+    if collection_name is not None:
+        request["collection"] = collection_name
+    if vectorstore_dir is not None:
+        request["vectorstore_dir"] = str(Path(vectorstore_dir).resolve())
+    if embedding_model is not None:
+        request["embedding_model"] = embedding_model
+    if embedding_backend is not None:
+        request["embedding_backend"] = embedding_backend
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(str(socket_path))
+            with conn.makefile("rwb") as stream:
+                stream.write(json.dumps(request).encode("utf-8") + b"\n")
+                stream.flush()
+                line = stream.readline()
+    except OSError as exc:
+        raise QueryDaemonError(f"Query daemon at {socket_path} unavailable: {exc}") from exc
+
+    if not line:
+        raise QueryDaemonError(f"Query daemon at {socket_path} closed the connection")
+    response = json.loads(line)
+    if "error" in response:
+        raise QueryDaemonError(response["error"])
+    return response
+
+
+class QueryDaemon:
+    """Embeds questions and queries one Chroma collection with a preloaded model."""
+
+    def __init__(
+        self,
+        collection,
+        embedding_fn,
+        collection_name: str,
+        vectorstore_dir: Optional[Path] = None,
+        embedding_model: Optional[str] = None,
+        embedding_backend: Optional[str] = None,
+    ):
+        self.collection = collection
+        self.embedding_fn = embedding_fn
+        self.collection_name = collection_name
+        self.vectorstore_dir = Path(vectorstore_dir).resolve() if vectorstore_dir else None
+        self.embedding_model = embedding_model
+        self.embedding_backend = embedding_backend
+        self._encode_lock = threading.Lock()
+
+    @classmethod
+    def from_paths(
+        cls,
+        vectorstore_dir: Path,
+        collection_name: str,
+        embedding_model: str,
+        embedding_backend: str = "torch",
+    ) -> "QueryDaemon":
+        """Open the vector store and load the embedding model once."""
+        client = chromadb.PersistentClient(path=str(vectorstore_dir))
+        collection = client.get_collection(collection_name, embedding_function=None)
+        embedding_fn = build_embedding_function(embedding_model, backend=embedding_backend)
+        # Warm up so the first client request does not pay for lazy initialization.
+        embedding_fn(["warmup"])
+        return cls(
+            collection,
+            embedding_fn,
+            collection_name,
+            vectorstore_dir=vectorstore_dir,
+            embedding_model=embedding_model,
+            embedding_backend=embedding_backend,
+        )
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer one decoded request."""
+        question = request.get("question")
+        if not isinstance(question, str) or not question:
+            return {"error": "Request must include a non-empty 'question'"}
+        for key, label, served in (
+            ("collection", "collection", self.collection_name),
+            ("vectorstore_dir", "vector store", self.vectorstore_dir and str(self.vectorstore_dir)),
+            ("embedding_model", "embedding model", self.embedding_model),
+            ("embedding_backend", "embedding backend", self.embedding_backend),
+        ):
+            requested = request.get(key)
+            if requested is not None and served is not None and requested != served:
+                return {"error": f"Daemon serves {label} '{served}', not '{requested}'"}
+
+        with self._encode_lock:
+            embedding = self.embedding_fn([question])[0]
+        result = self.collection.query(
+            query_embeddings=[[float(value) for value in embedding]],
+            n_results=max(1, int(request.get("k", 3))),
+            include=["documents", "metadatas", "distances"],
+        )
+        return {
+            "ids": result.get("ids", [[]])[0],
+            "documents": result.get("documents", [[]])[0],
+            "metadatas": result.get("metadatas", [[]])[0],
+            "distances": result.get("distances", [[]])[0] if result.get("distances") else [],
+        }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            response = self.server.service.handle(json.loads(line))
+        except Exception as exc:
+            logger.exception("Query daemon request failed")
+            response = {"error": str(exc)}
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+if DAEMON_SUPPORTED:
+
+    class QueryDaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """Unix socket server dispatching requests to a QueryDaemon."""
+
+        daemon_threads = True
+
+        def __init__(self, socket_path: Union[str, Path], service: QueryDaemon):
+            self.socket_path = Path(socket_path)
+            _remove_stale_socket(self.socket_path)
+            self.service = service
+            super().__init__(str(self.socket_path), _RequestHandler)
+            stat_info = os.lstat(self.socket_path)
+            self._bound_socket_id = (stat_info.st_dev, stat_info.st_ino)
+
+        def server_close(self) -> None:
+            super().server_close()
+            # Only remove the socket this server bound: inode numbers are reused,
+            # so a path another daemon has since bound is also recognised by it
+            # still accepting connections now that this listener is closed
+            try:
+                stat_info = os.lstat(self.socket_path)
+            except FileNotFoundError:
+                return
+            if (stat_info.st_dev, stat_info.st_ino) != self._bound_socket_id:
+                return
+            try:
+                if _socket_accepts_connections(self.socket_path):
+                    return
+            except OSError:
+                return
+            self.socket_path.unlink()
+
+
+def _socket_accepts_connections(socket_path: Path) -> bool:
+    """Return True if a server is listening on ``socket_path``.
+
+    Raises:
+        OSError: If connecting fails for a reason other than a refusal.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(socket_path))
+        except ConnectionRefusedError:
+            return False
+    return True
+
+
+def _remove_stale_socket(socket_path: Path) -> None:
+    """Remove a socket left behind by a daemon that is no longer running.
+
+    Raises:
+        QueryDaemonError: If the path is not a socket or a daemon still
+            accepts connections on it.
+    """
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise QueryDaemonError(f"{socket_path} exists and is not a unix socket")
+    try:
+        live = _socket_accepts_connections(socket_path)
+    except OSError as exc:
+        raise QueryDaemonError(f"Cannot reuse socket {socket_path}: {exc}") from exc
+    if live:
+        raise QueryDaemonError(f"Another query daemon is already listening on {socket_path}")
+    socket_path.unlink()
@@ -4,6 +4,19 @@ from dataclasses import dataclass, field, asdict
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+    import json
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    """Serialize a dict to UTF-8 JSON bytes, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
 
 @dataclass(slots=True)
 class Document:
@@ -20,6 +33,16 @@ class Document:
         data["path"] = str(self.path)
         return data
 
+    def to_json_bytes(self) -> bytes:
+        """Serialize directly to JSON bytes without the asdict deep copy."""
+        return _dumps({
+            "doc_id": self.doc_id,
+            "path": str(self.path),
+            "source_type": self.source_type,
+            "text": self.text,
+            "metadata": self.metadata,
+        })
+
 
 @dataclass(slots=True)
 class DocumentChunk:
@@ -42,6 +65,10 @@ class DocumentChunk:
             "metadata": self.metadata,
         }
 
+    def to_json_bytes(self) -> bytes:
+        """Serialize to a single JSON line (without trailing newline)."""
+        return _dumps(self.to_dict())
+
 
 @dataclass(slots=True)
 class FailureInfo:
@@ -15,7 +15,8 @@ PAGE_NUMBER_PATTERNS = [
     r"^\s*pg\.\s*\d+\s*$",
 ]
 
-# Boilerplate patterns
+# Boilerplate patterns. An optional token between two runs of whitespace is
+# grouped with the run after it, so lines of spaces cannot backtrack quadratically.
 BOILERPLATE_PATTERNS = [
     r"(?i)^\s*confidential\s*$",
     r"(?i)^\s*proprietary\s*(and\s+)?confidential\s*$",
@@ -30,11 +31,11 @@ BOILERPLATE_PATTERNS = [
     r"(?i)^\s*do\s+not\s+copy\s*$",
     r"(?i)^\s*do\s+not\s+forward\s*$",
     r"(?i)^\s*all\s+rights\s+reserved\.?\s*$",
-    r"(?i)^\s*copyright\s*(?:\u00a9|\(c\))?\s*\d{4}.*$",
+    r"(?i)^\s*copyright\s*(?:(?:\u00a9|\(c\))\s*)?\d{4}.*$",
     r"^\s*\u00a9\s*\d{4}.*$",
     r"(?i)^\s*\(c\)\s*\d{4}.*$",
-    r"(?i)^\s*disclaimer\s*:?\s*$",
-    r"(?i)^\s*legal\s+notice\s*:?\s*$",
+    r"(?i)^\s*disclaimer\s*(?::\s*)?$",
+    r"(?i)^\s*legal\s+notice\s*(?::\s*)?$",
 ]
 
 # Special character replacements
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 import logging
 import re
+from collections import Counter
+from collections.abc import Iterable
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -21,8 +24,139 @@ from .normalization_rules import (
 
 logger = logging.getLogger(__name__)
 
+# Leading global inline flags, e.g. "(?i)" in "(?i)^\s*draft\s*$"
+_GLOBAL_FLAGS_PATTERN = re.compile(r"^\(\?([aiLmsux]+)\)")
 
-@dataclass
+
+def _scope_inline_flags(pattern: str) -> str:
+    """Turn leading global flags into a scoped group so patterns can be combined.
+
+    Python only accepts global flags such as ``(?i)`` at the very start of an
+    expression, so ``"(?i)^draft$"`` becomes ``"(?i:^draft$)"``. Verbose
+    patterns get a newline before the closing parenthesis so a trailing
+    ``# comment`` does not swallow it.
+    """
+    match = _GLOBAL_FLAGS_PATTERN.match(pattern)
+    if match is None:
+        return pattern
+    flags = match.group(1)
+    body = pattern[match.end():]
+    if "x" in flags:
+        body += "\n"
+    return f"(?{flags}:{body})"
+
+
+def _combine_line_patterns(categories: dict[str, list[str]]) -> re.Pattern | None:
+    """Combine per-category line patterns into one alternation.
+
+    Each category becomes a named group, so ``match.lastgroup`` identifies
+    which category a line matched. Categories are tried in insertion order.
+
+    Args:
+        categories: Mapping of category name to its regex patterns.
+
+    Returns:
+        Compiled pattern, or None if there are no patterns.
+    """
+    groups = [
+        f"(?P<{name}>" + "|".join(f"(?:{_scope_inline_flags(p)})" for p in patterns) + ")"
+        for name, patterns in categories.items()
+        if patterns
+    ]
+    if not groups:
+        return None
+    return re.compile("|".join(groups))
+
+
+# Constructs whose meaning depends on group numbering or names within a pattern
+_GROUP_REFERENCE_PATTERN = re.compile(r"\\[1-9]|\(\?P[<=]|\(\?<[^=!]|\(\?\(")
+
+
+def _compile_custom_patterns(patterns: tuple[str, ...]) -> tuple[re.Pattern, ...]:
+    """Compile custom line patterns, combining them into one alternation when safe.
+
+    Patterns that use backreferences, named groups or conditionals are kept
+    separate, since combining them would renumber or clash their groups.
+    """
+    compiled = tuple(re.compile(pattern) for pattern in patterns)
+    if len(compiled) < 2 or any(_GROUP_REFERENCE_PATTERN.search(p) for p in patterns):
+        return compiled
+    return (re.compile("|".join(f"(?:{_scope_inline_flags(p)})" for p in patterns)),)
+
+
+@dataclass(frozen=True, slots=True)
+class _CompiledPatterns:
+    """Patterns and lookup tables derived from a normalization configuration."""
+
+    char_table: tuple[tuple[str, str, str], ...]
+    char_table_non_ascii: bool
+    line_filter_pattern: re.Pattern | None
+    custom_replacement_pattern: re.Pattern | None
+    custom_patterns: tuple[re.Pattern, ...]
+
+
+@lru_cache(maxsize=16)
+def _build_compiled(
+    zero_width_chars: tuple[str, ...],
+    special_chars: tuple[tuple[str, str], ...],
+    bullet_chars: tuple[str, ...],
+    page_number_patterns: tuple[str, ...],
+    boilerplate_patterns: tuple[str, ...],
+    custom_patterns: tuple[str, ...],
+    custom_replacement_keys: tuple[str, ...],
+) -> _CompiledPatterns:
+    """Compile the patterns for one configuration, cached across normalizers.
+
+    Arguments are the rule data that is enabled; disabled rules are passed
+    as empty tuples (see ``TextNormalizer._pattern_key``).
+    """
+    # Single-character replacements as (char, replacement, removed_patterns key)
+    char_table = (
+        [(char, "", "zero_width_chars") for char in zero_width_chars]
+        + [(old_char, new_char, "special_chars") for old_char, new_char in special_chars]
+        + [(bullet, "-", "bullet_chars") for bullet in bullet_chars]
+    )
+
+    # Page number and boilerplate patterns, fused so each line is matched once
+    line_filter_pattern = _combine_line_patterns(
+        {"page_numbers": list(page_number_patterns), "boilerplate": list(boilerplate_patterns)}
+    )
+
+    # Custom replacements, longest key first so overlapping keys match leftmost-longest
+    replacement_keys = sorted((key for key in custom_replacement_keys if key), key=len, reverse=True)
+    custom_replacement_pattern = (
+        re.compile("|".join(re.escape(key) for key in replacement_keys))
+        if replacement_keys
+        else None
+    )
+
+    return _CompiledPatterns(
+        char_table=tuple(char_table),
+        # Every built-in character is non-ASCII, so pure ASCII text can skip the table
+        char_table_non_ascii=all(not char.isascii() for char, _, _ in char_table),
+        line_filter_pattern=line_filter_pattern,
+        custom_replacement_pattern=custom_replacement_pattern,
+        custom_patterns=_compile_custom_patterns(custom_patterns),
+    )
+
+
+# (rule name, removed_patterns key) for character replacements, in application order
+_CHAR_RULES = (
+    ("remove_zero_width", "zero_width_chars"),
+    ("normalize_special_chars", "special_chars"),
+    ("normalize_bullets", "bullet_chars"),
+)
+
+# (rule name, removed_patterns key) for line filters, in application order
+_LINE_FILTER_RULES = (
+    ("remove_page_numbers", "page_numbers"),
+    ("remove_boilerplate", "boilerplate"),
+    ("remove_headers_footers", "headers_footers"),
+    ("custom_patterns", "custom_patterns"),
+)
+
+
+@dataclass(slots=True)
 class NormalizationConfig:
     """Configuration options for text normalization.
 
@@ -40,6 +174,8 @@ class NormalizationConfig:
         header_footer_max_length: Maximum line length to consider as header/footer (longer lines preserved).
         custom_patterns: Additional regex patterns to remove.
         custom_replacements: Additional character replacements {from: to}.
+        collect_stats: Record rules_applied and removed_patterns in the result
+            (disable to skip the counting work when only the text is needed).
     """
 
     remove_page_numbers: bool = True
@@ -55,9 +191,10 @@ class NormalizationConfig:
     header_footer_max_length: int = 100
     custom_patterns: list[str] = field(default_factory=list)
     custom_replacements: dict[str, str] = field(default_factory=dict)
+    collect_stats: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class NormalizationResult:
     """Result of text normalization.
 
@@ -101,29 +238,62 @@ class TextNormalizer:
         self._compile_patterns()
 
     def _compile_patterns(self) -> None:
-        """Pre-compile regex patterns for performance."""
-        # Page number patterns
-        self._page_number_patterns = [
-            re.compile(pattern) for pattern in PAGE_NUMBER_PATTERNS
-        ]
+        """Pre-compile regex patterns for performance.
 
-        # Boilerplate patterns
-        self._boilerplate_patterns = [
-            re.compile(pattern) for pattern in BOILERPLATE_PATTERNS
-        ]
-
-        # Custom patterns
-        self._custom_patterns = [
-            re.compile(pattern) for pattern in self.config.custom_patterns
-        ]
+        Only the patterns needed by enabled rules are compiled.
+        """
+        compiled = _build_compiled(*self._pattern_key(self.config))
+        self._char_table = compiled.char_table
+        self._char_table_non_ascii = compiled.char_table_non_ascii
+        self._line_filter_pattern = compiled.line_filter_pattern
+        self._custom_replacement_pattern = compiled.custom_replacement_pattern
+        self._custom_patterns = compiled.custom_patterns
 
         # Code block pattern for preservation
-        self._code_block_pattern = re.compile(r"```[\s\S]*?```", re.MULTILINE)
+        if self.config.preserve_code_blocks:
+            self._code_block_pattern = re.compile(r"```[\s\S]*?```", re.MULTILINE)
+            self._code_block_placeholder_pattern = re.compile(r"\x00CODE_BLOCK_(\d+)\x00")
 
         # Whitespace patterns
-        self._multi_newline_pattern = re.compile(r"\n{3,}")
-        self._multi_space_pattern = re.compile(r"[ \t]{2,}")
-        self._trailing_whitespace_pattern = re.compile(r"[ \t]+$", re.MULTILINE)
+        if self.config.normalize_whitespace:
+            self._multi_newline_pattern = re.compile(r"\n{3,}")
+            self._multi_space_pattern = re.compile(r"[ \t]{2,}")
+            self._trailing_whitespace_pattern = re.compile(r"[ \t]+$", re.MULTILINE)
+
+    @staticmethod
+    def _pattern_key(config: NormalizationConfig) -> tuple:
+        """Build the cache key for the patterns a configuration needs.
+
+        Disabled rules contribute an empty tuple, so configurations that only
+        differ in unrelated settings share the same compiled patterns.
+        """
+        custom_keys = tuple(sorted(config.custom_replacements))
+        special_chars: tuple[tuple[str, str], ...] = ()
+        if config.normalize_special_chars:
+            special_chars = tuple(
+                (old_char, new_char)
+                for old_char, new_char in SPECIAL_CHAR_MAP.items()
+                if old_char not in config.custom_replacements
+            )
+        return (
+            tuple(ZERO_WIDTH_CHARS) if config.remove_zero_width else (),
+            special_chars,
+            tuple(BULLET_CHARS) if config.normalize_bullets else (),
+            tuple(PAGE_NUMBER_PATTERNS) if config.remove_page_numbers else (),
+            tuple(BOILERPLATE_PATTERNS) if config.remove_boilerplate else (),
+            tuple(config.custom_patterns),
+            custom_keys,
+        )
+
+    @classmethod
+    def precompile(cls, configs: Iterable[NormalizationConfig]) -> None:
+        """Compile and cache the patterns for each configuration ahead of use.
+
+        Args:
+            configs: Configurations that normalizers will be created with.
+        """
+        for config in configs:
+            _build_compiled(*cls._pattern_key(config))
 
     def normalize(self, text: str) -> NormalizationResult:
         """Normalize the input text according to configuration.
@@ -135,67 +305,55 @@ class TextNormalizer:
             NormalizationResult containing the normalized text and metadata.
         """
         original_length = len(text)
+        collect_stats = self.config.collect_stats
         rules_applied: list[str] = []
         removed_patterns: dict[str, int] = {}
 
+        # Nothing to normalize in empty text (custom patterns may still match
+        # its single empty line, so they take the full path)
+        if not text and not self._custom_patterns:
+            if self.config.normalize_whitespace and collect_stats:
+                rules_applied.append("normalize_whitespace")
+            return NormalizationResult(
+                text="",
+                original_length=original_length,
+                normalized_length=0,
+                rules_applied=rules_applied,
+                removed_patterns=removed_patterns,
+            )
+
         # Preserve code blocks if configured
         code_blocks: list[str] = []
-        if self.config.preserve_code_blocks:
+        if self.config.preserve_code_blocks and "```" in text:
             text, code_blocks = self._extract_code_blocks(text)
-            if code_blocks:
+            if code_blocks and collect_stats:
                 rules_applied.append("preserve_code_blocks")
 
-        # Remove zero-width characters first
-        if self.config.remove_zero_width:
-            text, count = self._remove_zero_width(text)
-            if count > 0:
-                rules_applied.append("remove_zero_width")
-                removed_patterns["zero_width_chars"] = count
-
-        # Normalize special characters
-        if self.config.normalize_special_chars:
-            text, count = self._normalize_special_chars(text)
-            if count > 0:
-                rules_applied.append("normalize_special_chars")
-                removed_patterns["special_chars"] = count
-
-        # Normalize bullets
-        if self.config.normalize_bullets:
-            text, count = self._normalize_bullets(text)
-            if count > 0:
-                rules_applied.append("normalize_bullets")
-                removed_patterns["bullet_chars"] = count
-
-        # Remove page numbers
-        if self.config.remove_page_numbers:
-            text, count = self._remove_page_numbers(text)
-            if count > 0:
-                rules_applied.append("remove_page_numbers")
-                removed_patterns["page_numbers"] = count
-
-        # Remove boilerplate
-        if self.config.remove_boilerplate:
-            text, count = self._remove_boilerplate(text)
-            if count > 0:
-                rules_applied.append("remove_boilerplate")
-                removed_patterns["boilerplate"] = count
-
-        # Remove headers/footers (repeated lines)
-        if self.config.remove_headers_footers:
-            text, count = self._remove_headers_footers(text)
-            if count > 0:
-                rules_applied.append("remove_headers_footers")
-                removed_patterns["headers_footers"] = count
-
-        # Apply custom patterns
-        if self._custom_patterns:
-            text, count = self._apply_custom_patterns(text)
-            if count > 0:
-                rules_applied.append("custom_patterns")
-                removed_patterns["custom_patterns"] = count
+        # Remove zero-width characters, then normalize special characters and bullets
+        if self._char_table:
+            text, char_counts = self._replace_chars(text)
+            for rule, key in _CHAR_RULES:
+                count = char_counts.get(key, 0)
+                if count > 0:
+                    rules_applied.append(rule)
+                    removed_patterns[key] = count
+
+        # Remove page numbers, boilerplate, headers/footers and custom pattern
+        # lines in a single split/join pass
+        if (
+            self._line_filter_pattern is not None
+            or self.config.remove_headers_footers
+            or self._custom_patterns
+        ):
+            text, line_counts = self._filter_lines(text)
+            for rule, key in _LINE_FILTER_RULES:
+                count = line_counts.get(key, 0)
+                if count > 0 and collect_stats:
+                    rules_applied.append(rule)
+                    removed_patterns[key] = count
 
         # Apply custom replacements
-        if self.config.custom_replacements:
+        if self._custom_replacement_pattern is not None:
             text, count = self._apply_custom_replacements(text)
             if count > 0:
                 rules_applied.append("custom_replacements")
@@ -204,16 +362,18 @@ class TextNormalizer:
         # Normalize whitespace (do this last before restoring code blocks)
         if self.config.normalize_whitespace:
             text = self._normalize_whitespace(text)
-            rules_applied.append("normalize_whitespace")
+            if collect_stats:
+                rules_applied.append("normalize_whitespace")
 
         # Restore code blocks
         if self.config.preserve_code_blocks and code_blocks:
             text = self._restore_code_blocks(text, code_blocks)
 
+        text = text.strip()
         return NormalizationResult(
-            text=text.strip(),
+            text=text,
             original_length=original_length,
-            normalized_length=len(text.strip()),
+            normalized_length=len(text),
             rules_applied=rules_applied,
             removed_patterns=removed_patterns,
         )
@@ -221,6 +381,9 @@ class TextNormalizer:
     def _extract_code_blocks(self, text: str) -> tuple[str, list[str]]:
         """Extract code blocks and replace with placeholders.
 
+        Placeholders are delimited by NUL characters, which no normalization
+        rule touches and which do not occur in ordinary text.
+
         Args:
             text: The input text.
 
@@ -231,13 +394,13 @@ class TextNormalizer:
 
         def replace_block(match: re.Match) -> str:
             code_blocks.append(match.group(0))
-            return f"__CODE_BLOCK_{len(code_blocks) - 1}__"
+            return f"\x00CODE_BLOCK_{len(code_blocks) - 1}\x00"
 
         text = self._code_block_pattern.sub(replace_block, text)
         return text, code_blocks
 
     def _restore_code_blocks(self, text: str, code_blocks: list[str]) -> str:
-        """Restore code blocks from placeholders.
+        """Restore code blocks from placeholders in a single pass.
 
         Args:
             text: Text with placeholders.
@@ -246,201 +409,172 @@ class TextNormalizer:
         Returns:
             Text with code blocks restored.
         """
-        for i, block in enumerate(code_blocks):
-            text = text.replace(f"__CODE_BLOCK_{i}__", block)
-        return text
+        def restore_block(match: re.Match) -> str:
+            index = int(match.group(1))
+            return code_blocks[index] if index < len(code_blocks) else match.group(0)
 
-    def _remove_zero_width(self, text: str) -> tuple[str, int]:
-        """Remove zero-width and invisible characters.
+        return self._code_block_placeholder_pattern.sub(restore_block, text)
 
-        Args:
-            text: The input text.
-
-        Returns:
-            Tuple of (cleaned text, count of characters removed).
-        """
-        count = 0
-        for char in ZERO_WIDTH_CHARS:
-            char_count = text.count(char)
-            if char_count > 0:
-                text = text.replace(char, "")
-                count += char_count
-        return text, count
-
-    def _normalize_special_chars(self, text: str) -> tuple[str, int]:
-        """Replace special characters with ASCII equivalents.
+    def _replace_chars(self, text: str) -> tuple[str, dict[str, int]]:
+        """Remove zero-width characters and normalize special characters and bullets.
 
         Args:
             text: The input text.
 
         Returns:
-            Tuple of (normalized text, count of replacements).
+            Tuple of (normalized text, mapping of category to characters replaced).
+            The mapping is empty when stats collection is disabled.
         """
-        count = 0
-        char_map = {**SPECIAL_CHAR_MAP, **self.config.custom_replacements}
-        for old_char, new_char in char_map.items():
-            if old_char in self.config.custom_replacements:
-                continue  # Handle custom replacements separately
-            char_count = text.count(old_char)
+        counts: dict[str, int] = {}
+        if self._char_table_non_ascii and text.isascii():
+            return text, counts
+
+        if not self.config.collect_stats:
+            for char, replacement, _ in self._char_table:
+                text = text.replace(char, replacement)
+            return text, counts
+
+        for char, replacement, key in self._char_table:
+            if not replacement:
+                # Deletions are counted from the length change, saving a scan
+                length = len(text)
+                text = text.replace(char, "")
+                char_count = (length - len(text)) // len(char)
+            else:
+                char_count = text.count(char)
+                if char_count > 0:
+                    text = text.replace(char, replacement)
             if char_count > 0:
-                text = text.replace(old_char, new_char)
-                count += char_count
-        return text, count
+                counts[key] = counts.get(key, 0) + char_count
+        return text, counts
 
-    def _normalize_bullets(self, text: str) -> tuple[str, int]:
-        """Normalize various bullet characters to standard dash.
+    def _filter_lines(self, text: str) -> tuple[str, dict[str, int]]:
+        """Remove page number, boilerplate, header/footer and custom pattern lines.
 
-        Args:
-            text: The input text.
-
-        Returns:
-            Tuple of (normalized text, count of replacements).
-        """
-        count = 0
-        for bullet in BULLET_CHARS:
-            char_count = text.count(bullet)
-            if char_count > 0:
-                text = text.replace(bullet, "-")
-                count += char_count
-        return text, count
-
-    def _remove_page_numbers(self, text: str) -> tuple[str, int]:
-        """Remove lines matching page number patterns.
+        The text is split once and every filter works on the shared line list,
+        in the same order the individual rules have always been applied.
 
         Args:
             text: The input text.
 
         Returns:
-            Tuple of (cleaned text, count of lines removed).
+            Tuple of (cleaned text, mapping of category to lines removed).
         """
         lines = text.split("\n")
-        filtered_lines: list[str] = []
-        count = 0
-
-        for line in lines:
-            is_page_number = False
-            for pattern in self._page_number_patterns:
-                if pattern.match(line):
-                    is_page_number = True
-                    count += 1
-                    break
-            if not is_page_number:
-                filtered_lines.append(line)
+        line_count = len(lines)
+        counts: dict[str, int] = {}
+
+        if self._line_filter_pattern is not None:
+            match = self._line_filter_pattern.match
+            kept_lines: list[str] = []
+            for line in lines:
+                matched = match(line)
+                if matched is None:
+                    kept_lines.append(line)
+                else:
+                    category = matched.lastgroup
+                    counts[category] = counts.get(category, 0) + 1
+            lines = kept_lines
 
-        return "\n".join(filtered_lines), count
+        if self.config.remove_headers_footers:
+            lines, count = self._remove_headers_footers(lines)
+            counts["headers_footers"] = count
 
-    def _remove_boilerplate(self, text: str) -> tuple[str, int]:
-        """Remove lines matching boilerplate patterns.
+        if self._custom_patterns:
+            lines, count = self._apply_custom_patterns(lines)
+            counts["custom_patterns"] = count
 
-        Args:
-            text: The input text.
+        # Nothing removed: the original text is already the result
+        if len(lines) == line_count:
+            return text, counts
+        return "\n".join(lines), counts
 
-        Returns:
-            Tuple of (cleaned text, count of lines removed).
-        """
-        lines = text.split("\n")
-        filtered_lines: list[str] = []
-        count = 0
-
-        for line in lines:
-            is_boilerplate = False
-            for pattern in self._boilerplate_patterns:
-                if pattern.match(line):
-                    is_boilerplate = True
-                    count += 1
-                    break
-            if not is_boilerplate:
-                filtered_lines.append(line)
-
-        return "\n".join(filtered_lines), count
-
-    def _remove_headers_footers(self, text: str) -> tuple[str, int]:
+    def _remove_headers_footers(self, lines: list[str]) -> tuple[list[str], int]:
         """Remove repeated lines that appear to be headers/footers.
 
         This identifies lines that appear multiple times in the document,
         especially at regular intervals, and removes them.
 
         Args:
-            text: The input text.
+            lines: The input lines.
 
         Returns:
-            Tuple of (cleaned text, count of lines removed).
+            Tuple of (remaining lines, count of lines removed).
         """
-        lines = text.split("\n")
-        if len(lines) < 3:
-            return text, 0
-
-        # Count line occurrences (ignoring very short and empty lines)
-        line_counts: dict[str, int] = {}
-        for line in lines:
-            stripped = line.strip()
-            if len(stripped) >= self.config.min_line_length and stripped:
-                line_counts[stripped] = line_counts.get(stripped, 0) + 1
+        # A line can only repeat often enough if there are at least threshold lines
+        threshold = self.config.header_footer_threshold
+        if len(lines) < max(3, threshold):
+            return lines, 0
+
+        # Count occurrences of lines short enough to be headers/footers
+        # (ignoring very short and empty lines); long lines are never counted
+        stripped_lines = [line.strip() for line in lines]
+        min_length = max(self.config.min_line_length, 1)
+        max_length = self.config.header_footer_max_length
+        line_counts = Counter(
+            stripped for stripped in stripped_lines if min_length <= len(stripped) < max_length
+        )
 
         # Identify header/footer candidates (lines appearing multiple times)
-        header_footer_lines: set[str] = set()
-        for line, count in line_counts.items():
-            if count >= self.config.header_footer_threshold:
-                # Only consider lines shorter than max length as potential headers/footers
-                if len(line) < self.config.header_footer_max_length:
-                    header_footer_lines.add(line)
+        header_footer_lines = {line for line, count in line_counts.items() if count >= threshold}
+        if not header_footer_lines:
+            return lines, 0
 
         # Filter out header/footer lines
-        filtered_lines: list[str] = []
-        removal_count = 0
-        for line in lines:
-            stripped = line.strip()
-            if stripped in header_footer_lines:
-                removal_count += 1
-            else:
-                filtered_lines.append(line)
+        filtered_lines = [
+            line
+            for line, stripped in zip(lines, stripped_lines)
+            if stripped not in header_footer_lines
+        ]
+        removal_count = len(lines) - len(filtered_lines)
 
-        return "\n".join(filtered_lines), removal_count
+        return filtered_lines, removal_count
 
-    def _apply_custom_patterns(self, text: str) -> tuple[str, int]:
+    def _apply_custom_patterns(self, lines: list[str]) -> tuple[list[str], int]:
         """Apply custom regex patterns to remove matching lines.
 
         Custom patterns are applied per-line, removing entire lines that match.
         This is consistent with how page numbers and boilerplate are handled.
 
         Args:
-            text: The input text.
+            lines: The input lines.
 
         Returns:
-            Tuple of (cleaned text, count of lines removed).
+            Tuple of (remaining lines, count of lines removed).
         """
-        lines = text.split("\n")
-        filtered_lines: list[str] = []
-        count = 0
-
-        for line in lines:
-            matched = False
-            for pattern in self._custom_patterns:
-                if pattern.match(line):
-                    matched = True
-                    count += 1
-                    break
-            if not matched:
-                filtered_lines.append(line)
-
-        return "\n".join(filtered_lines), count
+        patterns = self._custom_patterns
+        if len(patterns) == 1:
+            # Usual case: custom patterns are combined into a single alternation
+            match = patterns[0].match
+            filtered_lines = [line for line in lines if match(line) is None]
+        else:
+            filtered_lines = [
+                line for line in lines if not any(pattern.match(line) for pattern in patterns)
+            ]
+
+        return filtered_lines, len(lines) - len(filtered_lines)
 
     def _apply_custom_replacements(self, text: str) -> tuple[str, int]:
-        """Apply custom character replacements.
+        """Apply custom string replacements in a single scan.
+
+        All keys are matched at once, leftmost-longest, so a replacement is
+        never re-scanned by another key.
 
         Args:
             text: The input text.
 
         Returns:
-            Tuple of (cleaned text, count of replacements).
+            Tuple of (cleaned text, count of replacements). The count is 0
+            when stats collection is disabled.
         """
-        count = 0
-        for old_str, new_str in self.config.custom_replacements.items():
-            char_count = text.count(old_str)
-            if char_count > 0:
-                text = text.replace(old_str, new_str)
-                count += char_count
-        return text, count
+        replacements = self.config.custom_replacements
+
+        def replace(match: re.Match) -> str:
+            return replacements[match.group()]
+
+        if not self.config.collect_stats:
+            return self._custom_replacement_pattern.sub(replace, text), 0
+        return self._custom_replacement_pattern.subn(replace, text)
 
     def _normalize_whitespace(self, text: str) -> str:
         """Normalize whitespace in the text.
@@ -454,17 +588,24 @@ class TextNormalizer:
         Returns:
             Text with normalized whitespace.
         """
+        # Each step is skipped when a substring check (a single C-level scan)
+        # shows its pattern cannot match, which is the common case for clean text
+
         # Normalize line endings
-        text = text.replace("\r\n", "\n").replace("\r", "\n")
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
 
         # Remove trailing whitespace from lines
-        text = self._trailing_whitespace_pattern.sub("", text)
+        if " \n" in text or "\t\n" in text or text.endswith((" ", "\t")):
+            text = self._trailing_whitespace_pattern.sub("", text)
 
         # Collapse multiple spaces/tabs
-        text = self._multi_space_pattern.sub(" ", text)
+        if "  " in text or "\t" in text:
+            text = self._multi_space_pattern.sub(" ", text)
 
         # Collapse multiple newlines (more than 2) into exactly 2
-        text = self._multi_newline_pattern.sub("\n\n", text)
+        if "\n\n\n" in text:
+            text = self._multi_newline_pattern.sub("\n\n", text)
 
         return text
 
@@ -554,6 +695,7 @@ class TextNormalizer:
                 header_footer_max_length=yaml_config.get("header_footer_max_length", 100),
                 custom_patterns=yaml_config.get("custom_patterns", []),
                 custom_replacements=yaml_config.get("custom_replacements", {}),
+                collect_stats=yaml_config.get("collect_stats", True),
             )
         except (TypeError, ValueError) as e:
             raise ValueError(f"Invalid configuration in {yaml_path}: {e}") from e
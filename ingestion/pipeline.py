@@ -1,22 +1,35 @@
 ﻿from __future__ import annotations
 
 import logging
+import os
 import traceback
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import closing
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
 
 from .chunker import chunk_document
 from .loader import DocumentLoader, UnsupportedDocumentError, discover_documents
-from .models import FailureInfo
+from .models import Document, DocumentChunk, FailureInfo
 from .normalizer import NormalizationConfig, TextNormalizer
 from .storage import StorageManager
 
 logger = logging.getLogger(__name__)
 
+# Background threads loading documents ahead of chunking in a sequential run,
+# and how many loaded documents may be waiting at once
+_LOADER_THREADS = 4
+_PREFETCH_DOCUMENTS = 8
+# Persisted documents between manifest writes; bounds the work lost on a crash
+_MANIFEST_FLUSH_INTERVAL = 64
 
-@dataclass
+
+@dataclass(slots=True)
 class PipelineConfig:
     """Configuration for the ingestion pipeline.
 
@@ -28,6 +41,10 @@ class PipelineConfig:
         fail_fast: Stop on first failure instead of continuing.
         normalization_config: Optional configuration for text normalization.
         cleanup_deleted: Remove orphaned docs whose source files were deleted.
+        workers: Number of processes used to load and chunk documents
+            (1 processes documents sequentially in the current process,
+            0 uses one process per CPU, leaving one CPU for the main process).
+        pdf_backend: PDF parser used by the loader (see ``loader.PDF_BACKENDS``).
     """
 
     input_dir: Path
@@ -37,9 +54,73 @@ class PipelineConfig:
     fail_fast: bool = False
     normalization_config: Optional[NormalizationConfig] = field(default=None)
     cleanup_deleted: bool = False
+    workers: int = 1
+    pdf_backend: str = "pypdf2"
+
+
+# Loaded document, its content hash, and its chunks (None when already up to date)
+PreparedDocument = Tuple[Document, str, Optional[List[DocumentChunk]]]
+
+
+def _build_loader(config: PipelineConfig) -> DocumentLoader:
+    normalizer: Optional[TextNormalizer] = None
+    if config.normalization_config is not None:
+        normalizer = TextNormalizer(config.normalization_config)
+    return DocumentLoader(
+        config.input_dir, normalizer=normalizer, pdf_backend=config.pdf_backend
+    )
+
+
+def _prepare_document(
+    loader: DocumentLoader,
+    config: PipelineConfig,
+    is_up_to_date: Callable[[str, str], bool],
+    path: Path,
+) -> PreparedDocument:
+    """Load and chunk one document, skipping chunking if it is up to date."""
+    document, content_hash = loader.load(path)
+    return _chunk_loaded_document(config, is_up_to_date, document, content_hash)
+
+
+def _chunk_loaded_document(
+    config: PipelineConfig,
+    is_up_to_date: Callable[[str, str], bool],
+    document: Document,
+    content_hash: str,
+) -> PreparedDocument:
+    if is_up_to_date(document.doc_id, content_hash):
+        return document, content_hash, None
+    chunks = chunk_document(
+        document,
+        chunk_size_tokens=config.chunk_size_tokens,
+        chunk_overlap_percent=config.chunk_overlap_percent,
+    )
+    return document, content_hash, chunks
+
+
+# Per-process state for worker processes, set up once by _init_worker
+_worker_loader: Optional[DocumentLoader] = None
+_worker_config: Optional[PipelineConfig] = None
+_worker_content_hashes: Dict[str, str] = {}
 
 
-@dataclass
+def _init_worker(config: PipelineConfig, content_hashes: Dict[str, str]) -> None:
+    global _worker_loader, _worker_config, _worker_content_hashes
+    _worker_loader = _build_loader(config)
+    _worker_config = config
+    _worker_content_hashes = content_hashes
+
+
+def _prepare_document_in_worker(path: Path) -> PreparedDocument:
+    return _prepare_document(
+        _worker_loader,
+        _worker_config,
+        lambda doc_id, content_hash: _worker_content_hashes.get(doc_id) == content_hash,
+        path,
+    )
+
+
+@dataclass(slots=True)
 class PipelineResult:
     processed: int
     skipped: int
@@ -66,14 +147,97 @@ class IngestionPipeline:
             config: Pipeline configuration including paths and normalization settings.
         """
         self.config = config
+        self.loader = _build_loader(config)
+        self.storage = StorageManager(config.output_dir)
 
-        # Create normalizer if config provided
-        normalizer: Optional[TextNormalizer] = None
-        if config.normalization_config is not None:
-            normalizer = TextNormalizer(config.normalization_config)
+    def _changed_documents(self, documents: List[Path]) -> List[Path]:
+        """Return the documents whose mtime or size differ from the manifest.
 
-        self.loader = DocumentLoader(config.input_dir, normalizer=normalizer)
-        self.storage = StorageManager(config.output_dir)
+        Unchanged documents are skipped without being read or hashed; anything
+        that cannot be stat'ed is kept so loading reports the error.
+        """
+        changed: List[Path] = []
+        for path in documents:
+            try:
+                stat_info = path.stat()
+            except OSError:
+                changed.append(path)
+                continue
+            if self.storage.is_unchanged_on_disk(self.loader.doc_id_for(path), stat_info):
+                logger.info("Skipping %s (no changes detected)", path)
+            else:
+                changed.append(path)
+        return changed
+
+    def _iter_prepared(
+        self, documents: List[Path]
+    ) -> Iterator[Tuple[Path, Callable[[], PreparedDocument]]]:
+        """Yield each path with a callable returning its prepared document.
+
+        The callable raises whatever loading or chunking raised, so callers
+        can handle failures per document. With a single worker, documents are
+        loaded ahead in background threads and yielded in order; with more,
+        they are prepared in a process pool and yielded as they complete.
+        Storage is only ever touched from the current thread.
+        """
+        if len(documents) <= 1:
+            for path in documents:
+                yield path, partial(
+                    _prepare_document, self.loader, self.config, self.storage.is_up_to_date, path
+                )
+            return
+
+        workers = self.config.workers
+        if workers <= 0:
+            workers = max(1, (os.cpu_count() or 1) - 1)
+        if workers == 1:
+            yield from self._iter_prefetched(documents)
+            return
+
+        executor = ProcessPoolExecutor(
+            max_workers=min(workers, len(documents)),
+            initializer=_init_worker,
+            initargs=(self.config, self.storage.content_hashes()),
+        )
+        try:
+            futures = {
+                executor.submit(_prepare_document_in_worker, path): path for path in documents
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _iter_prefetched(
+        self, documents: List[Path]
+    ) -> Iterator[Tuple[Path, Callable[[], PreparedDocument]]]:
+        """Yield documents in order, loading the next few in background threads.
+
+        Loading (file reads and hashing) overlaps with chunking and persisting
+        on the current thread. At most ``_PREFETCH_DOCUMENTS`` loads are in
+        flight, so memory stays bounded.
+        """
+        executor = ThreadPoolExecutor(max_workers=_LOADER_THREADS)
+        try:
+            remaining = iter(documents)
+            pending: Deque[Tuple[Path, Future]] = deque(
+                (path, executor.submit(self.loader.load, path))
+                for path in islice(remaining, _PREFETCH_DOCUMENTS)
+            )
+            while pending:
+                path, future = pending.popleft()
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    pending.append((next_path, executor.submit(self.loader.load, next_path)))
+                yield path, partial(self._chunk_prefetched, future)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _chunk_prefetched(self, future: Future) -> PreparedDocument:
+        document, content_hash = future.result()
+        return _chunk_loaded_document(
+            self.config, self.storage.is_up_to_date, document, content_hash
+        )
 
     def run(self, document_paths: Optional[List[Path]] = None) -> PipelineResult:
         """Run the ingestion pipeline.
@@ -100,66 +264,81 @@ class IngestionPipeline:
                 (end - start).total_seconds(),
             )
 
-        for path in documents:
-            try:
-                document, content_hash = self.loader.load(path)
-                if self.storage.is_up_to_date(document.doc_id, content_hash):
-                    skipped += 1
-                    logger.info("Skipping %s (no changes detected)", path)
-                    continue
-
-                chunks = chunk_document(
-                    document,
-                    chunk_size_tokens=self.config.chunk_size_tokens,
-                    chunk_overlap_percent=self.config.chunk_overlap_percent,
-                )
+        changed_documents = self._changed_documents(documents)
+        skipped = len(documents) - len(changed_documents)
 
-                if not chunks:
-                    skipped += 1
-                    logger.warning("No chunks produced for %s", path)
-                    continue
-
-                self.storage.persist_document(document, chunks, content_hash)
-                processed += 1
-                chunk_total += len(chunks)
-                logger.info(
-                    "Processed %s -> %d chunks",
-                    document.metadata.get("relative_path", document.doc_id),
-                    len(chunks),
-                )
-            except UnsupportedDocumentError as exc:
-                failed += 1
-                failure = FailureInfo(
-                    source_path=str(path),
-                    doc_id=None,
-                    error_type=type(exc).__name__,
-                    error_message=str(exc),
-                    traceback=traceback.format_exc(),
-                    timestamp=datetime.utcnow().isoformat() + "Z",
-                )
-                failures.append(failure)
-                logger.error("Unsupported document: %s", exc)
-                if self.config.fail_fast:
-                    raise
-            except Exception as exc:  # pylint: disable=broad-except
-                failed += 1
-                failure = FailureInfo(
-                    source_path=str(path),
-                    doc_id=None,
-                    error_type=type(exc).__name__,
-                    error_message=str(exc),
-                    traceback=traceback.format_exc(),
-                    timestamp=datetime.utcnow().isoformat() + "Z",
-                )
-                failures.append(failure)
-                logger.exception("Failed to process %s", path)
-                if self.config.fail_fast:
-                    raise
+        # Documents persisted since the last periodic flush are only in the
+        # in-memory manifest, so flush however the loop ends
+        try:
+            with closing(self._iter_prepared(changed_documents)) as prepared_documents:
+                for path, prepare in prepared_documents:
+                    try:
+                        document, content_hash, chunks = prepare()
+                        if chunks is None:
+                            self.storage.refresh_file_stat(document)
+                            skipped += 1
+                            logger.info("Skipping %s (no changes detected)", path)
+                            continue
+
+                        if not chunks:
+                            skipped += 1
+                            logger.warning("No chunks produced for %s", path)
+                            continue
+
+                        self.storage.persist_document(
+                            document, chunks, content_hash, flush_manifest=False
+                        )
+                        processed += 1
+                        if processed % _MANIFEST_FLUSH_INTERVAL == 0:
+                            self.storage.flush_manifest()
+                        chunk_total += len(chunks)
+                        logger.info(
+                            "Processed %s -> %d chunks",
+                            document.metadata.get("relative_path", document.doc_id),
+                            len(chunks),
+                        )
+                    except UnsupportedDocumentError as exc:
+                        failed += 1
+                        failure = FailureInfo(
+                            source_path=str(path),
+                            doc_id=None,
+                            error_type=type(exc).__name__,
+                            error_message=str(exc),
+                            # Always raised by the extension check in
+                            # DocumentLoader.load, so the stack adds nothing
+                            # unless debugging
+                            traceback=(
+                                traceback.format_exc()
+                                if logger.isEnabledFor(logging.DEBUG)
+                                else ""
+                            ),
+                            timestamp=datetime.utcnow().isoformat() + "Z",
+                        )
+                        failures.append(failure)
+                        logger.error("Unsupported document: %s", exc)
+                        if self.config.fail_fast:
+                            raise
+                    except Exception as exc:  # pylint: disable=broad-except
+                        failed += 1
+                        failure = FailureInfo(
+                            source_path=str(path),
+                            doc_id=None,
+                            error_type=type(exc).__name__,
+                            error_message=str(exc),
+                            traceback=traceback.format_exc(),
+                            timestamp=datetime.utcnow().isoformat() + "Z",
+                        )
+                        failures.append(failure)
+                        logger.exception("Failed to process %s", path)
+                        if self.config.fail_fast:
+                            raise
+        finally:
+            self.storage.flush_manifest()
 
         # Cleanup orphaned documents if enabled
         cleaned_up = 0
         if self.config.cleanup_deleted:
-            current_paths = [str(p.resolve()) for p in documents]
+            current_paths = [os.path.realpath(p) for p in documents]
             orphaned = self.storage.find_orphaned_docs(current_paths)
             if orphaned:
                 cleaned_up = self.storage.cleanup_orphaned_docs(orphaned)
@@ -178,8 +357,14 @@ class IngestionPipeline:
             cleaned_up,
         )
 
-        # Save failures and report
-        self.storage.save_failures(failures)
-        self.storage.save_report(result)
+        # Save failures and report; the files are independent, so their
+        # serialization and fsync overlap
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            saves = [
+                executor.submit(self.storage.save_failures, failures),
+                executor.submit(self.storage.save_report, result),
+            ]
+        for save in saves:
+            save.result()
 
         return result
@@ -1,18 +1,66 @@
 ﻿from __future__ import annotations
 
+import itertools
 import json
 import logging
+import os
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, Iterable, List
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
+from .loader import RACY_MTIME_NS
 from .models import Document, DocumentChunk, FailureInfo
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 if TYPE_CHECKING:
     from .pipeline import PipelineResult
 
 logger = logging.getLogger(__name__)
 
+# Larger manifests are parsed with the stdlib json module: orjson is faster
+# but its peak memory while parsing is about 1.5x higher
+_ORJSON_MAX_MANIFEST_BYTES = 32 * 1024 * 1024
+
+# Chunk files are written through a large buffer so a many-chunk document is
+# flushed in a handful of write() calls instead of one per 8 KiB
+_CHUNK_WRITE_BUFFER_BYTES = 1024 * 1024
+
+
+def _dumps_indented(data: object) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` so readers never see a partial file.
+
+    The bytes go to a sibling temp file that is synced before being renamed
+    over ``path``; a crash mid-write leaves the previous file intact.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as fp:
+        fp.write(data)
+        fp.flush()
+        os.fsync(fp.fileno())
+    os.replace(tmp_path, path)
+
+
+def _trusted_mtime_ns(document: Document) -> Optional[int]:
+    """Return the document's mtime, or None if it is too recent to trust."""
+    # A file rewritten within the same timestamp tick keeps its mtime, so
+    # only recent mtimes are left out and such files get hashed next run
+    mtime_ns = document.metadata.get("mtime_ns")
+    if mtime_ns is not None and time.time_ns() - mtime_ns <= RACY_MTIME_NS:
+        return None
+    return mtime_ns
+
 
 class StorageManager:
     def __init__(self, output_root: Path):
@@ -26,42 +74,85 @@ class StorageManager:
         self.chunks_dir.mkdir(parents=True, exist_ok=True)
         self.logs_dir.mkdir(parents=True, exist_ok=True)
         self._manifest = self._load_manifest()
+        self._manifest_dirty = False
 
     def _load_manifest(self) -> Dict[str, Dict]:
         if self.manifest_path.exists():
             try:
+                if (
+                    orjson is not None
+                    and self.manifest_path.stat().st_size <= _ORJSON_MAX_MANIFEST_BYTES
+                ):
+                    return orjson.loads(self.manifest_path.read_bytes())
                 return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
             except json.JSONDecodeError:
                 logger.warning("Manifest corrupted; recreating.")
         return {}
 
     def _write_manifest(self) -> None:
-        self.manifest_path.write_text(
-            json.dumps(self._manifest, indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
+        _write_atomic(self.manifest_path, _dumps_indented(self._manifest))
+        self._manifest_dirty = False
+
+    def flush_manifest(self) -> None:
+        """Write the manifest if documents were persisted without flushing."""
+        if self._manifest_dirty:
+            self._write_manifest()
 
     def is_up_to_date(self, doc_id: str, content_hash: str) -> bool:
         entry = self._manifest.get(doc_id)
         return bool(entry and entry.get("content_hash") == content_hash)
 
+    def is_unchanged_on_disk(self, doc_id: str, stat_info: os.stat_result) -> bool:
+        """Return True if the file still has the mtime and size last ingested."""
+        entry = self._manifest.get(doc_id)
+        return bool(
+            entry
+            and entry.get("mtime_ns") is not None
+            and entry.get("mtime_ns") == stat_info.st_mtime_ns
+            and entry.get("size") == stat_info.st_size
+        )
+
+    def content_hashes(self) -> Dict[str, str]:
+        """Return the stored content hash of every document in the manifest."""
+        return {
+            doc_id: entry.get("content_hash")
+            for doc_id, entry in self._manifest.items()
+            if entry.get("content_hash")
+        }
+
     def persist_document(
         self,
         document: Document,
         chunks: Iterable[DocumentChunk],
         content_hash: str,
+        flush_manifest: bool = True,
     ) -> None:
-        chunk_list = list(chunks)
+        """Write a document's chunks and record it in the manifest.
+
+        With ``flush_manifest=False`` the manifest is only updated in memory;
+        call :meth:`flush_manifest` to write it out.
+        """
         chunk_file = self.chunks_dir / f"{document.doc_id}.jsonl"
-        with chunk_file.open("w", encoding="utf-8") as fp:
-            for chunk in chunk_list:
-                fp.write(json.dumps(chunk.to_dict(), ensure_ascii=False))
-                fp.write("\n")
+        # zip advances the counter once per chunk and stops on the chunks
+        # first, so chunks are streamed and counted without a list copy
+        counter = itertools.count()
+        with chunk_file.open("wb", buffering=_CHUNK_WRITE_BUFFER_BYTES) as fp:
+            # One writelines call; buffered IO coalesces the lines without
+            # building the whole file in memory
+            fp.writelines(
+                line
+                for chunk, _ in zip(chunks, counter)
+                for line in (chunk.to_json_bytes(), b"\n")
+            )
+        chunk_count = next(counter)
 
         manifest_entry = {
             "doc_id": document.doc_id,
             "content_hash": content_hash,
-            "chunk_count": len(chunk_list),
+            "mtime_ns": _trusted_mtime_ns(document),
+            "size": document.metadata.get("size_bytes"),
+            "chunk_count": chunk_count,
             "source_path": document.metadata.get("source_path"),
             "relative_path": document.metadata.get("relative_path"),
             "file_extension": document.metadata.get("file_extension"),
@@ -69,7 +160,29 @@ class StorageManager:
             "metadata": document.metadata,
         }
         self._manifest[document.doc_id] = manifest_entry
-        self._write_manifest()
+        if flush_manifest:
+            self._write_manifest()
+        else:
+            self._manifest_dirty = True
+
+    def refresh_file_stat(self, document: Document) -> None:
+        """Record a document's current mtime and size without re-persisting it.
+
+        Called for documents whose content hash still matches, so a touched
+        file (or an entry written without a trusted mtime) reaches the
+        stat-only fast path on the next run instead of being hashed again.
+        The manifest is marked dirty and written by :meth:`flush_manifest`.
+        """
+        entry = self._manifest.get(document.doc_id)
+        if entry is None:
+            return
+        mtime_ns = _trusted_mtime_ns(document)
+        size = document.metadata.get("size_bytes")
+        if entry.get("mtime_ns") == mtime_ns and entry.get("size") == size:
+            return
+        entry["mtime_ns"] = mtime_ns
+        entry["size"] = size
+        self._manifest_dirty = True
 
     def save_failures(self, failures: List[FailureInfo]) -> None:
         """Save failure information to failures.json.
@@ -78,10 +191,7 @@ class StorageManager:
             failures: List of FailureInfo objects to persist.
         """
         data = [f.to_dict() for f in failures]
-        self.failures_path.write_text(
-            json.dumps(data, indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
+        _write_atomic(self.failures_path, _dumps_indented(data))
         if failures:
             logger.info("Saved %d failure(s) to %s", len(failures), self.failures_path)
 
@@ -129,10 +239,7 @@ class StorageManager:
             "total_chunks": result.chunk_count,
             "failures": [f.to_dict() for f in result.failures],
         }
-        self.report_path.write_text(
-            json.dumps(report, indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
+        _write_atomic(self.report_path, _dumps_indented(report))
         logger.info("Saved ingestion report to %s", self.report_path)
 
     def find_orphaned_docs(self, current_source_paths: List[str]) -> List[str]:
@@ -144,20 +251,43 @@ class StorageManager:
         Returns:
             List of doc_ids that are orphaned (source file deleted).
         """
-        # Normalize all paths to resolved absolute paths for consistent comparison
-        current_paths_set = set(str(Path(p).resolve()) for p in current_source_paths)
-        orphaned = []
-
+        # The pipeline passes real paths and the manifest stores real paths,
+        # so an exact match settles almost every entry without a syscall
+        current_paths_set = set(current_source_paths)
+        candidates_by_dir: Dict[str, List[Tuple[str, str, str]]] = {}
         for doc_id, entry in self._manifest.items():
             source_path = entry.get("source_path")
-            if source_path:
-                resolved_source = str(Path(source_path).resolve())
-                if resolved_source not in current_paths_set:
-                    # Check if file actually exists on disk
-                    if not Path(source_path).exists():
-                        orphaned.append(doc_id)
-
-        return orphaned
+            if source_path and source_path not in current_paths_set:
+                parent, name = os.path.split(source_path)
+                candidates_by_dir.setdefault(parent, []).append((doc_id, source_path, name))
+        if not candidates_by_dir:
+            return []
+
+        # Check whether the remaining files exist: one listing per directory
+        # holding several candidates instead of a stat per file
+        missing = set()
+        for parent, candidates in candidates_by_dir.items():
+            if len(candidates) == 1:
+                doc_id, source_path, _ = candidates[0]
+                if not os.path.exists(source_path):
+                    missing.add(doc_id)
+                continue
+            try:
+                present = set(os.listdir(parent))
+            except OSError:
+                present = set()
+            missing.update(doc_id for doc_id, _, name in candidates if name not in present)
+        if not missing:
+            return []
+
+        # Fall back to resolved paths for anything listed under another spelling
+        current_resolved = {str(Path(p).resolve()) for p in current_source_paths}
+        return [
+            doc_id
+            for doc_id, entry in self._manifest.items()
+            if doc_id in missing
+            and str(Path(entry["source_path"]).resolve()) not in current_resolved
+        ]
 
     def cleanup_orphaned_docs(self, doc_ids: List[str]) -> int:
         """Remove orphaned documents from manifest and delete their chunk files.
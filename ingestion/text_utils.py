@@ -2,12 +2,13 @@
 
 import re
 from functools import lru_cache
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import tiktoken
 
 MULTI_NEWLINE_PATTERN = re.compile(r"\n{3,}")
 MULTI_SPACE_PATTERN = re.compile(r"[ \t]{2,}")
+TOKEN_ESTIMATE_PATTERN = re.compile(r"\w+|\S")
 NON_ASCII_QUOTES = {
     "\u201c": '"',
     "\u201d": '"',
@@ -17,19 +18,39 @@ NON_ASCII_QUOTES = {
     "\u2014": "-",
 }
 
-# Sentence boundary pattern - simple version
-# Matches: . ! ? followed by space and uppercase letter
-SENTENCE_END_PATTERN = re.compile(
-    r'(?<=[.!?])\s+(?=[A-Z])'
-)
+# Longest text whose token count is memoized by count_tokens
+_TOKEN_COUNT_CACHE_MAX_CHARS = 2048
 
-# Common abbreviations to avoid splitting on
+# Common abbreviations to avoid splitting on. Ordinary words such as "no" and
+# "ed" are left out: sentences ending in them must still split, and "No. 5"
+# never splits anyway since a boundary needs an uppercase letter after it
 ABBREVIATIONS = frozenset([
     'mr', 'mrs', 'ms', 'dr', 'prof', 'jr', 'sr', 'inc', 'ltd', 'corp',
-    'vs', 'etc', 'al', 'fig', 'no', 'vol', 'pp', 'ed', 'rev'
+    'vs', 'etc', 'al', 'fig', 'vol', 'pp', 'rev'
 ])
 
 
+def _abbreviation_lookbehinds(abbreviations: frozenset) -> str:
+    """Build negative lookbehinds rejecting a boundary right after "<abbrev>.".
+
+    Lookbehinds must be fixed width, so abbreviations are grouped by length.
+    """
+    by_length: Dict[int, List[str]] = {}
+    for abbreviation in sorted(abbreviations):
+        by_length.setdefault(len(abbreviation), []).append(abbreviation)
+    return "".join(
+        rf"(?<!\b(?i:{'|'.join(words)})\.)" for _, words in sorted(by_length.items())
+    )
+
+
+# Sentence boundary pattern
+# Matches: . ! ? followed by space and uppercase letter, unless the period
+# ends one of the abbreviations above
+SENTENCE_END_PATTERN = re.compile(
+    r'(?<=[.!?])' + _abbreviation_lookbehinds(ABBREVIATIONS) + r'\s+(?=[A-Z])'
+)
+
+
 @lru_cache(maxsize=4)
 def _get_tokenizer(encoding_name: str = "cl100k_base") -> tiktoken.Encoding:
     """Get a cached tiktoken encoding."""
@@ -48,17 +69,32 @@ def count_tokens(text: str, encoding: str = "cl100k_base") -> int:
     """
     if not text:
         return 0
-    tokenizer = _get_tokenizer(encoding)
-    return len(tokenizer.encode(text))
+    # Chunking counts the same paragraphs and sentences repeatedly; only short
+    # texts are cached so the cache stays small
+    if len(text) <= _TOKEN_COUNT_CACHE_MAX_CHARS:
+        return _count_tokens_cached(text, encoding)
+    return len(_get_tokenizer(encoding).encode(text))
+
+
+@lru_cache(maxsize=8192)
+def _count_tokens_cached(text: str, encoding: str) -> int:
+    return len(_get_tokenizer(encoding).encode(text))
 
 
 def normalize_text(text: str) -> str:
     """Clean up boilerplate whitespace and punctuation."""
-    normalized = text.replace("\r\n", "\n").replace("\r", "\n")
-    for bad, replacement in NON_ASCII_QUOTES.items():
-        normalized = normalized.replace(bad, replacement)
-    normalized = MULTI_NEWLINE_PATTERN.sub("\n\n", normalized)
-    normalized = MULTI_SPACE_PATTERN.sub(" ", normalized)
+    normalized = text
+    if "\r" in normalized:
+        normalized = normalized.replace("\r\n", "\n").replace("\r", "\n")
+    # Every mapped character is non-ASCII; isascii() is O(1) on str
+    if not normalized.isascii():
+        for bad, replacement in NON_ASCII_QUOTES.items():
+            normalized = normalized.replace(bad, replacement)
+    # Substring checks are far cheaper than a regex scan that finds nothing
+    if "\n\n\n" in normalized:
+        normalized = MULTI_NEWLINE_PATTERN.sub("\n\n", normalized)
+    if "  " in normalized or "\t" in normalized:
+        normalized = MULTI_SPACE_PATTERN.sub(" ", normalized)
     return normalized.strip()
 
 
@@ -67,7 +103,8 @@ def estimate_tokens(text: str) -> int:
 
     For accurate token counting, use count_tokens() instead.
     """
-    return max(1, len(re.findall(r"\w+|\S", text)))
+    # subn counts matches without materializing a string per token
+    return max(1, TOKEN_ESTIMATE_PATTERN.subn("", text)[1])
 
 
 def split_paragraphs(text: str) -> List[str]:
@@ -96,21 +133,9 @@ def split_sentences(text: str) -> List[str]:
 
     text = text.strip()
 
-    # Simple split on sentence boundaries
-    sentences = SENTENCE_END_PATTERN.split(text)
-
-    # Clean up and filter empty sentences
-    result = []
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if sentence:
-            result.append(sentence)
-
-    # If no splits occurred, return the original text
-    if not result:
-        return [text]
-
-    return result
+    # The split consumes all whitespace at each boundary and the text is
+    # stripped, so every piece is already trimmed and non-empty
+    return SENTENCE_END_PATTERN.split(text)
 
 
 def split_into_units(text: str, max_tokens: int, encoding: str = "cl100k_base") -> List[str]:
@@ -159,9 +184,13 @@ def _split_by_words(text: str, max_tokens: int, encoding: str = "cl100k_base") -
     result = []
     current_chunk: List[str] = []
     current_tokens = 0
+    # Words repeat heavily in natural text, so tokenize each distinct one once
+    word_token_counts: Dict[str, int] = {}
 
     for word in words:
-        word_tokens = count_tokens(word, encoding)
+        word_tokens = word_token_counts.get(word)
+        if word_tokens is None:
+            word_tokens = word_token_counts[word] = count_tokens(word, encoding)
 
         # If single word exceeds max, add it anyway (can't split further)
         if word_tokens > max_tokens:
@@ -6,6 +6,16 @@ import argparse
 import sys
 from pathlib import Path
 
+# Files for other frameworks and runtimes that SentenceTransformer never loads
+_IGNORED_MODEL_FILES = [
+    "*.h5",
+    "*.msgpack",
+    "*.ot",
+    "*.onnx",
+    "onnx/*",
+    "openvino/*",
+]
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -35,8 +45,19 @@ def main() -> int:
     try:
         from sentence_transformers import SentenceTransformer
 
-        # Download and save model
-        model = SentenceTransformer(args.model_name)
+        # Download and save model. Hub repo ids are fetched with parallel file
+        # downloads first, so loading the model needs no network; bare names
+        # are left to SentenceTransformer, which knows how to resolve them.
+        model_source = args.model_name
+        if "/" in args.model_name and not Path(args.model_name).exists():
+            from huggingface_hub import snapshot_download
+
+            model_source = snapshot_download(
+                args.model_name,
+                ignore_patterns=_IGNORED_MODEL_FILES,
+                max_workers=8,
+            )
+        model = SentenceTransformer(model_source)
 
         # Create a clean model name for the folder
         model_folder = args.model_name.replace("/", "_")
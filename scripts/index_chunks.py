@@ -5,6 +5,7 @@ import logging
 import sys
 from pathlib import Path
 
+from indexing.embeddings import EMBEDDING_BACKENDS
 from indexing.pipeline import ChromaIndexingPipeline, IndexingConfig
 
 
@@ -32,17 +33,63 @@ def parse_args() -> argparse.Namespace:
         default="sentence-transformers/all-MiniLM-L6-v2",
         help="SentenceTransformer model to embed chunks.",
     )
+    parser.add_argument(
+        "--embedding-backend",
+        choices=EMBEDDING_BACKENDS,
+        default="torch",
+        help=(
+            "Inference backend for chunk embeddings (onnx variants need "
+            "sentence-transformers[onnx]>=3.2)."
+        ),
+    )
+    parser.add_argument(
+        "--embedding-device",
+        default="cpu",
+        help="Device to embed chunks on, e.g. cuda or cuda:1 (default: cpu).",
+    )
+    parser.add_argument(
+        "--embedding-cache-dir",
+        type=Path,
+        default=None,
+        help="Reuse embeddings for identical chunk texts from this on-disk cache (off by default).",
+    )
     parser.add_argument(
         "--batch-size",
         type=int,
         default=32,
         help="Number of chunks to upsert per batch.",
     )
+    parser.add_argument(
+        "--encode-batch-size",
+        type=int,
+        default=256,
+        help="Number of chunks to embed per model call (default: 256).",
+    )
     parser.add_argument(
         "--doc-ids",
         nargs="+",
         help="Optional list of specific doc_ids to reindex (defaults to all).",
     )
+    parser.add_argument(
+        "--force-reembed",
+        action="store_true",
+        help="Re-embed every chunk, even those whose text is unchanged since the last run.",
+    )
+    parser.add_argument(
+        "--hnsw-m",
+        type=int,
+        help="HNSW graph degree used when the collection is created (Chroma default: 16).",
+    )
+    parser.add_argument(
+        "--hnsw-construction-ef",
+        type=int,
+        help="HNSW candidate list size while building the index (Chroma default: 100).",
+    )
+    parser.add_argument(
+        "--hnsw-search-ef",
+        type=int,
+        help="HNSW candidate list size at query time; also updates an existing collection.",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -79,17 +126,26 @@ def main() -> int:
         chroma_dir=Path(args.chroma_dir),
         collection_name=args.collection_name,
         embedding_model_name=args.embedding_model,
+        embedding_backend=args.embedding_backend,
+        embedding_device=args.embedding_device,
+        embedding_cache_dir=args.embedding_cache_dir,
         batch_size=args.batch_size,
+        encode_batch_size=args.encode_batch_size,
         doc_filter=args.doc_ids,
+        force_reembed=args.force_reembed,
+        hnsw_m=args.hnsw_m,
+        hnsw_construction_ef=args.hnsw_construction_ef,
+        hnsw_search_ef=args.hnsw_search_ef,
     )
 
     pipeline = ChromaIndexingPipeline(config)
     result = pipeline.run()
 
     logging.info(
-        "Chroma indexing complete: docs=%d chunks=%d skipped=%d failed=%d",
+        "Chroma indexing complete: docs=%d chunks=%d reused=%d skipped=%d failed=%d",
         result.indexed_docs,
         result.indexed_chunks,
+        result.reused_chunks,
         result.skipped_docs,
         result.failed_chunks,
     )
@@ -6,6 +6,7 @@ import sys
 from pathlib import Path
 from typing import Optional
 
+from ingestion.loader import PDF_BACKENDS
 from ingestion.normalizer import NormalizationConfig, TextNormalizer
 from ingestion.pipeline import IngestionPipeline, PipelineConfig
 from ingestion.storage import StorageManager
@@ -43,6 +44,18 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Remove orphaned documents whose source files have been deleted.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes used to load and chunk documents; 0 uses one per CPU minus one (default: 1).",
+    )
+    parser.add_argument(
+        "--pdf-backend",
+        choices=list(PDF_BACKENDS),
+        default="pypdf2",
+        help="PDF parser: pypdf2 (default), or the faster pypdfium2/pymupdf if installed.",
+    )
     parser.add_argument("--verbose", action="store_true", help="Enable debug logging output.")
 
     # Normalization arguments
@@ -180,9 +193,15 @@ def main() -> int:
         fail_fast=args.fail_fast,
         normalization_config=normalization_config,
         cleanup_deleted=args.cleanup,
+        workers=args.workers,
+        pdf_backend=args.pdf_backend,
     )
 
-    pipeline = IngestionPipeline(config)
+    try:
+        pipeline = IngestionPipeline(config)
+    except ValueError as e:
+        logging.error("%s", e)
+        return 1
     result = pipeline.run(document_paths=document_paths)
 
     # Print summary
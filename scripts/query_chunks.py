@@ -6,9 +6,26 @@ import sys
 from pathlib import Path
 
 import chromadb
-from chromadb.utils import embedding_functions
 
-from indexing.embeddings import get_model_path
+from indexing.embeddings import EMBEDDING_BACKENDS, build_embedding_function
+from indexing.query_daemon import daemon_socket_from_env
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _write_json(data: object) -> None:
+    """Write indented JSON to stdout, preferring orjson when installed."""
+    if orjson is not None:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.buffer.flush()
+        return
+    json.dump(data, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
 
 
 def parse_args() -> argparse.Namespace:
@@ -30,6 +47,12 @@ def parse_args() -> argparse.Namespace:
         default="sentence-transformers/all-MiniLM-L6-v2",
         help="SentenceTransformer model used to embed query text.",
     )
+    parser.add_argument(
+        "--embedding-backend",
+        choices=EMBEDDING_BACKENDS,
+        default="torch",
+        help="Inference backend for query embeddings (onnx variants need sentence-transformers[onnx]).",
+    )
     parser.add_argument(
         "--question",
         required=True,
@@ -62,9 +85,12 @@ def format_result(
     distance: float | None,
     max_chars: int,
 ) -> str:
-    snippet = document.strip().replace("\n", " ")
+    # Only the displayed prefix needs its newlines replaced
+    snippet = document.strip()
     if len(snippet) > max_chars:
-        snippet = snippet[: max_chars - 3].rstrip() + "..."
+        snippet = snippet[: max_chars - 3].replace("\n", " ").rstrip() + "..."
+    else:
+        snippet = snippet.replace("\n", " ")
 
     rel_path = metadata.get("relative_path") or metadata.get("source_path")
     chunk_id = metadata.get("chunk_id")
@@ -114,25 +140,45 @@ def main() -> int:
         print(f"[error] Vector store path {vectorstore_path} not found.", file=sys.stderr)
         return 1
 
-    client = chromadb.PersistentClient(path=str(vectorstore_path))
-    # Resolve model path (prefers local model if available)
-    resolved_model = get_model_path(args.embedding_model)
-    embedding_fn = embedding_functions.SentenceTransformerEmbeddingFunction(
-        model_name=resolved_model,
-    )
-    collection = client.get_collection(
-        args.collection_name,
-        embedding_function=embedding_fn,
-    )
-    result = collection.query(
-        query_texts=[args.question],
-        n_results=max(1, args.k),
-    )
+    daemon_socket = daemon_socket_from_env()
+    if daemon_socket is not None:
+        from indexing.query_daemon import QueryDaemonError, query_daemon
+
+        try:
+            result = query_daemon(
+                daemon_socket,
+                args.question,
+                max(1, args.k),
+                collection_name=args.collection_name,
+                vectorstore_dir=vectorstore_path,
+                embedding_model=args.embedding_model,
+                embedding_backend=args.embedding_backend,
+            )
+        except QueryDaemonError as exc:
+            print(f"[error] {exc}", file=sys.stderr)
+            return 1
+        documents = result["documents"]
+        metadatas = result["metadatas"]
+        ids = result["ids"]
+        distances = result["distances"]
+    else:
+        client = chromadb.PersistentClient(path=str(vectorstore_path))
+        # Embed the question ourselves so Chroma does not wrap another
+        # embedding function around the collection.
+        collection = client.get_collection(args.collection_name, embedding_function=None)
+        embedding_fn = build_embedding_function(
+            args.embedding_model, backend=args.embedding_backend
+        )
+        result = collection.query(
+            query_embeddings=embedding_fn([args.question]),
+            n_results=max(1, args.k),
+            include=["documents", "metadatas", "distances"],
+        )
 
-    documents = result.get("documents", [[]])[0]
-    metadatas = result.get("metadatas", [[]])[0]
-    ids = result.get("ids", [[]])[0]
-    distances = result.get("distances", [[]])[0] if result.get("distances") else []
+        documents = result.get("documents", [[]])[0]
+        metadatas = result.get("metadatas", [[]])[0]
+        ids = result.get("ids", [[]])[0]
+        distances = result.get("distances", [[]])[0] if result.get("distances") else []
 
     if args.pretty:
         output = []
@@ -148,8 +194,7 @@ def main() -> int:
                 "text": doc_text,
             }
             output.append(payload)
-        json.dump(output, sys.stdout, indent=2, ensure_ascii=False)
-        sys.stdout.write("\n")
+        _write_json(output)
         return 0
 
     if not documents:
@@ -0,0 +1,92 @@
+"""Run a resident query daemon so CLI queries skip embedding model start-up."""
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from indexing.embeddings import EMBEDDING_BACKENDS
+from indexing.query_daemon import (
+    DAEMON_SOCKET_ENV,
+    DAEMON_SUPPORTED,
+    QueryDaemon,
+    QueryDaemonError,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Serve semantic queries from a preloaded embedding model over a unix socket.",
+    )
+    parser.add_argument(
+        "--vectorstore-dir",
+        default="data/vectorstore",
+        help="Directory where Chroma persistence files live.",
+    )
+    parser.add_argument(
+        "--collection-name",
+        default="pilot-docs",
+        help="Chroma collection to serve.",
+    )
+    parser.add_argument(
+        "--embedding-model",
+        default="sentence-transformers/all-MiniLM-L6-v2",
+        help="SentenceTransformer model used to embed query text.",
+    )
+    parser.add_argument(
+        "--embedding-backend",
+        choices=EMBEDDING_BACKENDS,
+        default="torch",
+        help="Inference backend for query embeddings (onnx variants need sentence-transformers[onnx]).",
+    )
+    parser.add_argument(
+        "--socket",
+        default="data/query-daemon.sock",
+        help=f"Unix socket path to listen on (point {DAEMON_SOCKET_ENV} at it).",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if not DAEMON_SUPPORTED:
+        print(
+            "[error] The query daemon needs unix sockets, which this platform lacks.",
+            file=sys.stderr,
+        )
+        return 1
+    # Only defined where unix sockets exist, hence imported after the check
+    from indexing.query_daemon import QueryDaemonServer
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    vectorstore_path = Path(args.vectorstore_dir)
+    if not vectorstore_path.exists():
+        print(f"[error] Vector store path {vectorstore_path} not found.", file=sys.stderr)
+        return 1
+
+    service = QueryDaemon.from_paths(
+        vectorstore_path,
+        args.collection_name,
+        args.embedding_model,
+        embedding_backend=args.embedding_backend,
+    )
+    try:
+        server = QueryDaemonServer(args.socket, service)
+    except QueryDaemonError as exc:
+        print(f"[error] {exc}", file=sys.stderr)
+        return 1
+    print(f"[info] Query daemon listening on {args.socket}", file=sys.stderr)
+    print(f"[info] export {DAEMON_SOCKET_ENV}={args.socket}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
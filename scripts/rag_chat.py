@@ -12,6 +12,77 @@ from dotenv import load_dotenv
 
 from generation import ProviderError, create_llm_client, get_available_providers
 from generation.rag_chain import RAGChain, RAGConfig
+from indexing.embeddings import EMBEDDING_BACKENDS
+from indexing.query_daemon import daemon_socket_from_env
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _write_json(data: object, indent: bool = True) -> None:
+    """Write JSON to stdout, preferring orjson when installed.
+
+    With ``indent=False`` the payload is written as a single line.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(data, option=option))
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.buffer.flush()
+        return
+    json.dump(data, sys.stdout, indent=2 if indent else None, ensure_ascii=False)
+    sys.stdout.write("\n")
+    sys.stdout.flush()
+
+
+def _response_payload(question: str, response) -> dict:
+    """Build the JSON payload reported for one answered question."""
+    return {
+        "question": question,
+        "answer": response.answer,
+        "sources": [
+            {
+                "text": chunk[:200] + "..." if len(chunk) > 200 else chunk,
+                "metadata": metadata,
+                "distance": distance,
+            }
+            for chunk, metadata, distance in zip(
+                response.retrieved_chunks,
+                response.metadatas,
+                response.distances,
+            )
+        ],
+    }
+
+
+def _answer_stdin(rag_chain: RAGChain, args: argparse.Namespace) -> int:
+    """Answer one question per stdin line, writing one JSON line per answer.
+
+    The model, Chroma client and LLM client are initialized once for the
+    whole stream, so scripted batches pay start-up costs only once.
+    """
+    failures = 0
+    for line in sys.stdin:
+        question = line.strip()
+        if not question:
+            continue
+        try:
+            response = rag_chain.query(
+                question,
+                k=args.k,
+                max_tokens=args.max_tokens,
+                temperature=args.temperature,
+            )
+        except Exception as e:
+            failures += 1
+            print(f"[error] {e}", file=sys.stderr)
+            _write_json({"question": question, "error": str(e)}, indent=False)
+            continue
+        _write_json(_response_payload(question, response), indent=False)
+    return 1 if failures else 0
 
 
 def parse_args() -> argparse.Namespace:
@@ -33,6 +104,12 @@ def parse_args() -> argparse.Namespace:
         default="sentence-transformers/all-MiniLM-L6-v2",
         help="SentenceTransformer model used to embed query text.",
     )
+    parser.add_argument(
+        "--embedding-backend",
+        choices=EMBEDDING_BACKENDS,
+        default="torch",
+        help="Inference backend for query embeddings (onnx variants need sentence-transformers[onnx]).",
+    )
     parser.add_argument(
         "--question",
         "-q",
@@ -72,6 +149,11 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Run in interactive chat mode.",
     )
+    parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Answer one question per stdin line, emitting one JSON object per line.",
+    )
     parser.add_argument(
         "--env-file",
         default=".env",
@@ -122,13 +204,18 @@ def main() -> int:
         vectorstore_dir=vectorstore_path,
         collection_name=args.collection_name,
         embedding_model=args.embedding_model,
+        embedding_backend=args.embedding_backend,
         top_k=args.k,
         max_tokens=args.max_tokens,
         temperature=args.temperature,
+        daemon_socket=daemon_socket_from_env(),
     )
     rag_chain = RAGChain(llm_client, rag_config)
 
     # Determine mode
+    if args.stdin:
+        return _answer_stdin(rag_chain, args)
+
     if args.interactive or (not args.question):
         # Interactive mode
         rag_chain.chat_loop(k=args.k, show_sources=args.show_sources)
@@ -147,24 +234,7 @@ def main() -> int:
         return 1
 
     if args.json:
-        output = {
-            "question": args.question,
-            "answer": response.answer,
-            "sources": [
-                {
-                    "text": chunk[:200] + "..." if len(chunk) > 200 else chunk,
-                    "metadata": metadata,
-                    "distance": distance,
-                }
-                for chunk, metadata, distance in zip(
-                    response.retrieved_chunks,
-                    response.metadatas,
-                    response.distances,
-                )
-            ],
-        }
-        json.dump(output, sys.stdout, indent=2, ensure_ascii=False)
-        sys.stdout.write("\n")
+        _write_json(_response_payload(args.question, response))
     else:
         print(f"Question: {args.question}\n")
         print(f"Answer: {response.answer}\n")
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -48,6 +49,23 @@ class TestHealthCheck:
         assert result.document_count == 1
         assert "test-collection" in result.message
 
+    def test_health_check_with_precomputed_embeddings(self, tmp_path: Path):
+        """Test health check on a collection filled the way the indexer fills it."""
+        chroma_path = tmp_path / "chroma"
+
+        collection = get_collection(chroma_path, "test-collection", embedding_function=None)
+        collection.add(
+            ids=["doc1::chunk-0000", "doc1::chunk-0001"],
+            documents=["First chunk", "Second chunk"],
+            embeddings=[[0.1, 0.2, 0.3], [0.3, 0.2, 0.1]],
+            metadatas=[{"doc_id": "doc1"}, {"doc_id": "doc1"}],
+        )
+
+        result = health_check(chroma_path, collection_name="test-collection")
+
+        assert result.healthy is True
+        assert result.document_count == 2
+
     def test_health_check_collection_not_found(self, tmp_path: Path):
         """Test health check returns unhealthy for missing collection."""
         chroma_path = tmp_path / "chroma"
@@ -73,6 +91,59 @@ class TestHealthCheck:
         assert result.collection_count == 3
 
 
+class TestGetCollection:
+    """Tests for collection creation options."""
+
+    def test_hnsw_parameters_applied_on_create(self, tmp_path: Path):
+        collection = get_collection(
+            tmp_path / "chroma",
+            "tuned-collection",
+            hnsw_m=32,
+            hnsw_construction_ef=200,
+            hnsw_search_ef=64,
+        )
+
+        hnsw = collection.configuration["hnsw"]
+        assert hnsw["space"] == "cosine"
+        assert (hnsw["max_neighbors"], hnsw["ef_construction"], hnsw["ef_search"]) == (
+            32,
+            200,
+            64,
+        )
+
+    def test_search_ef_updated_on_existing_collection(self, tmp_path: Path):
+        chroma_path = tmp_path / "chroma"
+        get_collection(chroma_path, "tuned-collection", hnsw_search_ef=64)
+
+        collection = get_collection(chroma_path, "tuned-collection", hnsw_search_ef=150)
+
+        assert collection.configuration["hnsw"]["ef_search"] == 150
+
+    def test_collection_configuration_not_read_without_hnsw_options(self, tmp_path: Path):
+        collection = MagicMock(spec=["metadata", "modify"])
+        client = MagicMock()
+        client.get_or_create_collection.return_value = collection
+
+        with patch("indexing.chroma_store.chromadb.PersistentClient", return_value=client):
+            assert get_collection(tmp_path / "chroma", "plain-collection") is collection
+
+        collection.modify.assert_not_called()
+
+    def test_search_ef_falls_back_to_metadata_without_configuration(self, tmp_path: Path):
+        # chromadb releases before 1.x have no collection.configuration
+        collection = MagicMock(spec=["metadata", "modify"])
+        collection.metadata = {"hnsw:space": "cosine", "hnsw:search_ef": 64}
+        client = MagicMock()
+        client.get_or_create_collection.return_value = collection
+
+        with patch("indexing.chroma_store.chromadb.PersistentClient", return_value=client):
+            get_collection(tmp_path / "chroma", "tuned-collection", hnsw_search_ef=150)
+
+        collection.modify.assert_called_once_with(
+            metadata={"hnsw:space": "cosine", "hnsw:search_ef": 150}
+        )
+
+
 class TestHealthCheckResult:
     """Tests for HealthCheckResult dataclass."""
 
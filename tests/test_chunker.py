@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -13,7 +14,13 @@ from ingestion.chunker import (
     chunk_document,
 )
 from ingestion.models import Document
-from ingestion.text_utils import count_tokens, split_sentences, split_into_units
+from ingestion.text_utils import (
+    count_tokens,
+    estimate_tokens,
+    normalize_text,
+    split_sentences,
+    split_into_units,
+)
 
 
 class TestTokenCounting:
@@ -43,6 +50,48 @@ class TestTokenCounting:
         tokens2 = count_tokens(text)
         assert tokens1 == tokens2
 
+    def test_count_tokens_caches_short_texts_only(self):
+        """Test that short texts are tokenized once and long texts every time."""
+        tokenizer = MagicMock()
+        tokenizer.encode.return_value = [1, 2, 3]
+        short_text = "Cached token count for a short test string."
+        long_text = "word " * 1000
+        with patch("ingestion.text_utils._get_tokenizer", return_value=tokenizer):
+            assert count_tokens(short_text) == 3
+            assert count_tokens(short_text) == 3
+            assert tokenizer.encode.call_count == 1
+            count_tokens(long_text)
+            count_tokens(long_text)
+            assert tokenizer.encode.call_count == 3
+
+    def test_estimate_tokens_counts_words_and_punctuation(self):
+        """Test that estimate_tokens counts word runs and each other symbol."""
+        assert estimate_tokens("Hello, world!") == 4
+        assert estimate_tokens("naïve café — 3.5") == 6
+
+    def test_estimate_tokens_minimum_one(self):
+        """Test that estimate_tokens never returns less than one."""
+        assert estimate_tokens("") == 1
+        assert estimate_tokens("   ") == 1
+
+
+class TestNormalizeText:
+    """Tests for basic text normalization."""
+
+    def test_normalize_text_line_endings(self):
+        """Test that CRLF and CR line endings become LF."""
+        assert normalize_text("a\r\nb\rc") == "a\nb\nc"
+
+    def test_normalize_text_quotes_and_dashes(self):
+        """Test that typographic quotes and dashes become ASCII."""
+        text = "\u201cHi\u201d \u2018there\u2019 \u2013 caf\u00e9 \u2014 ok"
+        assert normalize_text(text) == "\"Hi\" 'there' - caf\u00e9 - ok"
+
+    def test_normalize_text_collapses_whitespace(self):
+        """Test that runs of blank lines and spaces or tabs are collapsed."""
+        assert normalize_text("a\n\n\n\nb  c\t\td \te") == "a\n\nb c d e"
+        assert normalize_text("a\n\nb c\td") == "a\n\nb c\td"
+
 
 class TestSentenceSplitting:
     """Tests for sentence boundary detection."""
@@ -66,6 +115,32 @@ class TestSentenceSplitting:
         # Should not split on "Dr."
         assert len(sentences) <= 3
 
+    def test_split_sentences_keeps_abbreviations_with_sentence(self):
+        """Test that a period ending a known abbreviation is not a boundary."""
+        text = "Dr. Smith met Mr. Jones. See Fig. Two for details! It costs 3.14 now."
+        assert split_sentences(text) == [
+            "Dr. Smith met Mr. Jones.",
+            "See Fig. Two for details!",
+            "It costs 3.14 now.",
+        ]
+
+    def test_split_sentences_abbreviation_needs_word_boundary(self):
+        """Test that words merely ending in an abbreviation still split."""
+        assert split_sentences("Play the piano.  Then wait.") == [
+            "Play the piano.",
+            "Then wait.",
+        ]
+
+    def test_split_sentences_after_ordinary_words(self):
+        """Test that sentences ending in words like "no" still split."""
+        assert split_sentences("I said no. We went home. She is Ed. He left.") == [
+            "I said no.",
+            "We went home.",
+            "She is Ed.",
+            "He left.",
+        ]
+        assert split_sentences("See item No. 5 in the list.") == ["See item No. 5 in the list."]
+
     def test_split_sentences_empty(self):
         """Test splitting empty text."""
         assert split_sentences("") == []
@@ -101,6 +176,19 @@ class TestSplitIntoUnits:
         """Test splitting empty text."""
         assert split_into_units("", max_tokens=100) == []
 
+    def test_split_by_words_tokenizes_each_distinct_word_once(self):
+        """Test that repeated words are only counted once when splitting."""
+        text = " ".join(["alpha", "beta"] * 20)
+        with patch(
+            "ingestion.text_utils.count_tokens",
+            side_effect=lambda chunk, encoding: len(chunk.split()),
+        ) as mock_count:
+            units = split_into_units(text, max_tokens=8)
+        # One call for the whole text, then one per distinct word
+        assert mock_count.call_count == 3
+        assert units[0] == "alpha beta alpha beta"
+        assert " ".join(units) == text
+
 
 class TestChunkDocument:
     """Tests for document chunking."""
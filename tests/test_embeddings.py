@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import sys
+import types
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 
 from indexing.embeddings import (
@@ -16,25 +19,95 @@ from indexing.embeddings import (
 )
 
 
+@pytest.fixture
+def mock_sentence_transformer():
+    """Replace sentence_transformers.SentenceTransformer and start with no loaded models."""
+    module = types.ModuleType("sentence_transformers")
+    module.SentenceTransformer = MagicMock(
+        side_effect=lambda *args, **kwargs: MagicMock(name=f"model{args}{kwargs}")
+    )
+    with patch.dict(sys.modules, {"sentence_transformers": module}), patch.dict(
+        "indexing.embeddings._LOADED_MODELS", clear=True
+    ):
+        yield module.SentenceTransformer
+
+
 class TestBuildEmbeddingFunction:
     """Tests for the build_embedding_function helper."""
 
-    def test_build_default_model(self):
+    def test_build_default_model(self, mock_sentence_transformer):
         """Test building embedding function with default model."""
-        with patch(
-            "indexing.embeddings.embedding_functions.SentenceTransformerEmbeddingFunction"
-        ) as mock_fn:
+        with patch("indexing.embeddings.get_model_path", side_effect=lambda name: name):
             build_embedding_function(DEFAULT_MODEL)
-            mock_fn.assert_called_once_with(model_name=DEFAULT_MODEL)
+        mock_sentence_transformer.assert_called_once_with(DEFAULT_MODEL, device="cpu")
 
-    def test_build_custom_model(self):
+    def test_build_custom_model(self, mock_sentence_transformer):
         """Test building embedding function with custom model name."""
         custom_model = "sentence-transformers/paraphrase-MiniLM-L6-v2"
+        build_embedding_function(custom_model)
+        mock_sentence_transformer.assert_called_once_with(custom_model, device="cpu")
+
+    def test_build_onnx_backend(self, mock_sentence_transformer):
+        """Test the ONNX backend is passed through to SentenceTransformer."""
+        build_embedding_function(DEFAULT_MODEL, backend="onnx")
+        kwargs = mock_sentence_transformer.call_args.kwargs
+        assert kwargs["backend"] == "onnx"
+        assert kwargs["model_kwargs"] == {"file_name": "onnx/model.onnx"}
+
+    def test_build_onnx_int8_backend_loads_quantized_weights(self, mock_sentence_transformer):
+        """Test the int8 backend selects a quantized ONNX file."""
+        with patch("indexing.embeddings.platform.machine", return_value="x86_64"):
+            build_embedding_function(DEFAULT_MODEL, backend="onnx-int8")
+        kwargs = mock_sentence_transformer.call_args.kwargs
+        assert kwargs["backend"] == "onnx"
+        assert kwargs["model_kwargs"] == {"file_name": "onnx/model_quint8_avx2.onnx"}
+
+    def test_build_onnx_backend_skips_local_copy_without_onnx_files(
+        self, tmp_path, mock_sentence_transformer
+    ):
+        """Test ONNX backends use the hub repo when the local copy lacks the weights."""
         with patch(
-            "indexing.embeddings.embedding_functions.SentenceTransformerEmbeddingFunction"
-        ) as mock_fn:
-            build_embedding_function(custom_model)
-            mock_fn.assert_called_once_with(model_name=custom_model)
+            "indexing.embeddings.get_model_path", return_value=str(tmp_path)
+        ), patch("indexing.embeddings.platform.machine", return_value="x86_64"):
+            build_embedding_function(DEFAULT_MODEL, backend="onnx-int8")
+            assert mock_sentence_transformer.call_args.args == (DEFAULT_MODEL,)
+
+            (tmp_path / "onnx").mkdir()
+            (tmp_path / "onnx" / "model_quint8_avx2.onnx").touch()
+            build_embedding_function(DEFAULT_MODEL, backend="onnx-int8")
+            assert mock_sentence_transformer.call_args.args == (str(tmp_path),)
+
+    def test_build_on_gpu_device(self, mock_sentence_transformer):
+        """Test a non-CPU device is passed through to SentenceTransformer."""
+        build_embedding_function(DEFAULT_MODEL, device="cuda")
+        assert mock_sentence_transformer.call_args.kwargs["device"] == "cuda"
+
+    def test_build_keeps_one_model_per_backend(self, mock_sentence_transformer):
+        """Test each backend of a model is loaded once and never shared."""
+        torch_fn = build_embedding_function(DEFAULT_MODEL)
+        onnx_fn = build_embedding_function(DEFAULT_MODEL, backend="onnx-int8")
+        torch_again = build_embedding_function(DEFAULT_MODEL)
+
+        assert onnx_fn.model is not torch_fn.model
+        assert torch_again.model is torch_fn.model
+        assert mock_sentence_transformer.call_count == 2
+
+    def test_embedding_function_encodes_texts(self, mock_sentence_transformer):
+        """Test calling the function encodes the texts with its model."""
+        embedding_fn = build_embedding_function(DEFAULT_MODEL)
+        embedding_fn.model.encode.return_value = np.array([[0.1, 0.2], [0.3, 0.4]])
+
+        result = embedding_fn(("first", "second"))
+
+        embedding_fn.model.encode.assert_called_once_with(
+            ["first", "second"], convert_to_numpy=True
+        )
+        assert np.allclose(result, [[0.1, 0.2], [0.3, 0.4]])
+
+    def test_build_unknown_backend_raises(self):
+        """Test an unknown backend is rejected before loading anything."""
+        with pytest.raises(ValueError, match="Unknown embedding backend"):
+            build_embedding_function(DEFAULT_MODEL, backend="tensorrt")
 
 
 class TestEmbeddingConfig:
@@ -44,6 +117,8 @@ class TestEmbeddingConfig:
         """Test default configuration values."""
         config = EmbeddingConfig()
         assert config.model_name == DEFAULT_MODEL
+        assert config.backend == "torch"
+        assert config.device == "cpu"
         assert config.max_retries == 3
         assert config.retry_delay == 1.0
         assert config.retry_backoff == 2.0
@@ -113,6 +188,19 @@ class TestEmbeddingService:
             assert result == [[0.1, 0.2, 0.3]]
             assert mock_fn.call_count == 2
 
+    def test_embed_batch_retry_delay_is_jittered(self):
+        """Retry waits are jittered around the exponential backoff delay."""
+        config = EmbeddingConfig(max_retries=3, retry_delay=1.0, retry_backoff=2.0)
+        service = EmbeddingService(config)
+        mock_fn = MagicMock(side_effect=[Exception("busy"), Exception("busy"), [[0.1]]])
+
+        with patch.object(service, "_embedding_fn", mock_fn), patch(
+            "indexing.embeddings.random.random", side_effect=[0.0, 1.0]
+        ), patch("indexing.embeddings.time.sleep") as mock_sleep:
+            service.embed_batch(["text"])
+
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.5, 3.0]
+
     def test_embed_batch_max_retries_exceeded_raises(self):
         """Test EmbeddingError raised after max retries exceeded."""
         config = EmbeddingConfig(max_retries=2, retry_delay=0.01)
@@ -132,6 +220,47 @@ class TestEmbeddingService:
             assert "Persistent error" in str(exc_info.value)
             assert mock_fn.call_count == 2
 
+    def test_embed_batch_cache_skips_cached_texts(self, tmp_path):
+        """Cached texts are not sent to the embedding function again."""
+        service = EmbeddingService(EmbeddingConfig(cache_dir=tmp_path))
+        mock_fn = MagicMock(side_effect=[[[0.1, 0.2], [0.3, 0.4]], [[0.5, 0.6]]])
+
+        with patch.object(service, "_embedding_fn", mock_fn):
+            first = service.embed_batch(["text1", "text2"])
+            second = service.embed_batch(["text2", "text3", "text3"])
+
+        assert mock_fn.call_args_list[1].args == (["text3"],)
+        assert np.allclose(first, [[0.1, 0.2], [0.3, 0.4]])
+        assert np.allclose(second, [[0.3, 0.4], [0.5, 0.6], [0.5, 0.6]])
+
+    def test_embed_batch_cache_persists_across_services(self, tmp_path):
+        """A new service reads embeddings written by an earlier one."""
+        writer = EmbeddingService(EmbeddingConfig(cache_dir=tmp_path))
+        with patch.object(writer, "_embedding_fn", MagicMock(return_value=[[0.1, 0.2]])):
+            writer.embed_batch(["text1"])
+
+        reader = EmbeddingService(EmbeddingConfig(cache_dir=tmp_path))
+        mock_fn = MagicMock()
+        with patch.object(reader, "_embedding_fn", mock_fn):
+            result = reader.embed_batch(["text1"])
+
+        mock_fn.assert_not_called()
+        assert np.allclose(result, [[0.1, 0.2]])
+
+    def test_embed_batch_cache_is_per_model(self, tmp_path):
+        """Switching model misses entries cached for another model."""
+        first = EmbeddingService(EmbeddingConfig(cache_dir=tmp_path))
+        with patch.object(first, "_embedding_fn", MagicMock(return_value=[[0.1, 0.2]])):
+            first.embed_batch(["text1"])
+
+        other = EmbeddingService(EmbeddingConfig(model_name="other/model", cache_dir=tmp_path))
+        mock_fn = MagicMock(return_value=[[0.9, 0.8]])
+        with patch.object(other, "_embedding_fn", mock_fn):
+            result = other.embed_batch(["text1"])
+
+        mock_fn.assert_called_once_with(["text1"])
+        assert np.allclose(result, [[0.9, 0.8]])
+
     def test_embedding_function_lazy_loading(self):
         """Test embedding function is lazily loaded."""
         service = EmbeddingService()
@@ -143,9 +272,22 @@ class TestEmbeddingService:
         ) as mock_build:
             mock_build.return_value = MagicMock()
             _ = service.embedding_function
-            mock_build.assert_called_once_with(DEFAULT_MODEL)
+            mock_build.assert_called_once_with(DEFAULT_MODEL, backend="torch", device="cpu")
             assert service._model_loaded is True
 
+    def test_backends_of_same_model_embed_with_their_own_model(self, mock_sentence_transformer):
+        """Test an int8 service is not handed a torch model loaded earlier."""
+        mock_sentence_transformer.side_effect = lambda *args, **kwargs: MagicMock(
+            encode=MagicMock(
+                return_value=np.array([[0.0 if "backend" in kwargs else 1.0]])
+            )
+        )
+        with patch("indexing.embeddings.platform.machine", return_value="x86_64"):
+            torch_service = EmbeddingService(EmbeddingConfig(backend="torch"))
+            int8_service = EmbeddingService(EmbeddingConfig(backend="onnx-int8"))
+            assert np.allclose(torch_service.embed_batch(["text"]), [[1.0]])
+            assert np.allclose(int8_service.embed_batch(["text"]), [[0.0]])
+
 
 class TestEmbeddingError:
     """Tests for EmbeddingError exception."""
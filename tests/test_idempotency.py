@@ -2,11 +2,13 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from ingestion import loader as loader_module
 from ingestion.storage import StorageManager
 from ingestion.pipeline import IngestionPipeline, PipelineConfig, PipelineResult
 from ingestion.models import Document, DocumentChunk
@@ -149,6 +151,48 @@ class TestPersistDocumentUpdates:
             assert len(lines) == 1
             assert "Updated" in lines[0]
 
+    def test_persist_document_counts_streamed_chunks(self, tmp_path: Path):
+        """Test that chunks from a generator are written and counted."""
+        storage = StorageManager(tmp_path)
+
+        doc = Document(
+            doc_id="test-doc",
+            path=Path("/fake/doc.txt"),
+            source_type="txt",
+            text="Test content",
+            metadata={},
+        )
+        chunks = (
+            DocumentChunk(f"test-doc::chunk-{i:04d}", "test-doc", i, f"Chunk {i}", 5, {})
+            for i in range(3)
+        )
+
+        storage.persist_document(doc, chunks, "hash_v1")
+
+        chunk_file = tmp_path / "chunks" / "test-doc.jsonl"
+        assert len(chunk_file.read_text(encoding="utf-8").splitlines()) == 3
+        assert storage._manifest["test-doc"]["chunk_count"] == 3
+
+    def test_persist_document_defers_manifest_until_flush(self, tmp_path: Path):
+        """Test that flush_manifest=False only writes the manifest on flush."""
+        storage = StorageManager(tmp_path)
+
+        doc = Document(
+            doc_id="test-doc",
+            path=Path("/fake/doc.txt"),
+            source_type="txt",
+            text="Test content",
+            metadata={},
+        )
+
+        storage.persist_document(doc, [], "hash_v1", flush_manifest=False)
+        assert not storage.manifest_path.exists()
+
+        storage.flush_manifest()
+        manifest = json.loads(storage.manifest_path.read_text(encoding="utf-8"))
+        assert manifest["test-doc"]["content_hash"] == "hash_v1"
+        assert not list(tmp_path.glob("*.tmp"))
+
 
 class TestOrphanedDocumentCleanup:
     """Tests for orphaned document cleanup functionality."""
@@ -186,6 +230,24 @@ class TestOrphanedDocumentCleanup:
         orphaned = storage.find_orphaned_docs([str(source_file)])
         assert "existing-doc" not in orphaned
 
+    def test_find_orphaned_docs_checks_shared_directory(self, tmp_path: Path):
+        """Test orphan detection for several manifest entries in one directory."""
+        storage = StorageManager(tmp_path / "output")
+
+        source_dir = tmp_path / "docs"
+        source_dir.mkdir()
+        kept = source_dir / "kept.txt"
+        kept.write_text("content")
+        for name in ("kept", "deleted-a", "deleted-b"):
+            storage._manifest[name] = {
+                "doc_id": name,
+                "source_path": str(source_dir / f"{name}.txt"),
+                "content_hash": "abc123",
+            }
+
+        # kept.txt exists even though it is not in the current paths
+        assert storage.find_orphaned_docs([]) == ["deleted-a", "deleted-b"]
+
     def test_cleanup_orphaned_docs_removes_manifest_entry(self, tmp_path: Path):
         """Test that cleanup_orphaned_docs removes from manifest."""
         storage = StorageManager(tmp_path)
@@ -293,6 +355,125 @@ class TestPipelineIdempotency:
         assert result2.processed == 1
         assert result2.skipped == 0
 
+    def test_pipeline_skips_unchanged_documents_without_loading(self, tmp_path: Path):
+        """Test that a matching mtime and size skips a document before loading."""
+        input_dir = tmp_path / "input"
+        output_dir = tmp_path / "output"
+        input_dir.mkdir()
+
+        doc_file = input_dir / "test.txt"
+        doc_file.write_text("Test content")
+        # Backdate the file so its mtime is recorded in the manifest
+        os.utime(doc_file, ns=(1_000_000_000_000_000_000, 1_000_000_000_000_000_000))
+
+        config = PipelineConfig(
+            input_dir=input_dir,
+            output_dir=output_dir,
+            chunk_size_tokens=400,
+        )
+
+        pipeline = IngestionPipeline(config)
+
+        result1 = pipeline.run()
+        assert result1.processed == 1
+
+        with patch.object(pipeline.loader, "load") as mock_load:
+            result2 = pipeline.run()
+        mock_load.assert_not_called()
+        assert result2.processed == 0
+        assert result2.skipped == 1
+
+    def test_pipeline_records_mtime_of_touched_unchanged_documents(self, tmp_path: Path):
+        """Test that a touched but unchanged file is hashed only once."""
+        input_dir = tmp_path / "input"
+        output_dir = tmp_path / "output"
+        input_dir.mkdir()
+
+        doc_file = input_dir / "test.txt"
+        doc_file.write_text("Test content")
+        os.utime(doc_file, ns=(1_000_000_000_000_000_000, 1_000_000_000_000_000_000))
+
+        config = PipelineConfig(
+            input_dir=input_dir,
+            output_dir=output_dir,
+            chunk_size_tokens=400,
+        )
+
+        pipeline = IngestionPipeline(config)
+        assert pipeline.run().processed == 1
+
+        # Touch the file without changing its content
+        os.utime(doc_file, ns=(1_100_000_000_000_000_000, 1_100_000_000_000_000_000))
+
+        with patch("ingestion.loader.hash_file", wraps=loader_module.hash_file) as mock_hash:
+            result2 = pipeline.run()
+        assert mock_hash.call_count == 1
+        assert result2.processed == 0
+        assert result2.skipped == 1
+
+        with patch("ingestion.loader.hash_file", wraps=loader_module.hash_file) as mock_hash:
+            result3 = pipeline.run()
+        mock_hash.assert_not_called()
+        assert result3.skipped == 1
+
+        # The refreshed stat survives a restart through the manifest
+        restarted = IngestionPipeline(config)
+        with patch("ingestion.loader.hash_file", wraps=loader_module.hash_file) as mock_hash:
+            restarted.run()
+        mock_hash.assert_not_called()
+
+    def test_pipeline_flushes_manifest_when_interrupted(self, tmp_path: Path):
+        """Test that documents persisted before an interrupt are in the manifest."""
+        input_dir = tmp_path / "input"
+        output_dir = tmp_path / "output"
+        input_dir.mkdir()
+
+        (input_dir / "doc1.txt").write_text("Document 1")
+        (input_dir / "doc2.txt").write_text("Document 2")
+
+        config = PipelineConfig(
+            input_dir=input_dir,
+            output_dir=output_dir,
+            chunk_size_tokens=400,
+        )
+
+        pipeline = IngestionPipeline(config)
+        chunk = DocumentChunk("doc::chunk-0000", "doc", 0, "Document", 2, {})
+        with patch(
+            "ingestion.pipeline.chunk_document",
+            side_effect=[[chunk], KeyboardInterrupt()],
+        ), pytest.raises(KeyboardInterrupt):
+            pipeline.run()
+
+        manifest = json.loads(pipeline.storage.manifest_path.read_text(encoding="utf-8"))
+        assert len(manifest) == 1
+
+    def test_pipeline_with_workers_skips_unchanged_documents(self, tmp_path: Path):
+        """Test that a multi-process run processes, then skips, every document."""
+        input_dir = tmp_path / "input"
+        output_dir = tmp_path / "output"
+        input_dir.mkdir()
+
+        (input_dir / "doc1.txt").write_text("Document 1")
+        (input_dir / "doc2.txt").write_text("Document 2")
+
+        config = PipelineConfig(
+            input_dir=input_dir,
+            output_dir=output_dir,
+            chunk_size_tokens=400,
+            workers=2,
+        )
+
+        pipeline = IngestionPipeline(config)
+
+        result1 = pipeline.run()
+        assert result1.processed == 2
+        assert result1.failed == 0
+
+        result2 = pipeline.run()
+        assert result2.processed == 0
+        assert result2.skipped == 2
+
     def test_pipeline_cleanup_removes_orphaned_docs(self, tmp_path: Path):
         """Test that pipeline with cleanup removes orphaned documents."""
         input_dir = tmp_path / "input"
@@ -353,3 +534,25 @@ class TestManifestDocIds:
 
         doc_ids = storage.get_manifest_doc_ids()
         assert doc_ids == []
+
+
+class TestModelJsonSerialization:
+    """Tests for direct JSON byte serialization of models."""
+
+    def test_chunk_to_json_bytes_matches_to_dict(self):
+        """Test that DocumentChunk.to_json_bytes round-trips to to_dict."""
+        chunk = DocumentChunk("doc::chunk-0000", "doc", 0, "Café — text", 3, {"page": 2})
+
+        assert json.loads(chunk.to_json_bytes()) == chunk.to_dict()
+
+    def test_document_to_json_bytes_matches_to_dict(self):
+        """Test that Document.to_json_bytes round-trips to to_dict."""
+        doc = Document(
+            doc_id="doc",
+            path=Path("/fake/doc.txt"),
+            source_type="txt",
+            text="Text",
+            metadata={"title": "Doc"},
+        )
+
+        assert json.loads(doc.to_json_bytes()) == doc.to_dict()
@@ -1,6 +1,12 @@
 """Unit tests for document loaders (PDF, DOCX, Markdown)."""
 from __future__ import annotations
 
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -8,13 +14,20 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from ingestion.loader import (
+    PDF_BACKENDS,
+    DocumentLoader,
     DocumentParseError,
+    _list_directory,
+    _pdf_info_metadata,
     _parse_pdf_date,
     _parse_yaml_frontmatter,
+    discover_documents,
+    hash_file,
     load_docx,
     load_markdown,
     load_pdf,
 )
+from ingestion.pipeline import IngestionPipeline, PipelineConfig
 
 
 class TestPDFLoader:
@@ -135,6 +148,89 @@ class TestPDFLoader:
             assert metadata["page_count"] == 1
 
 
+class TestPDFBackends:
+    """Tests for selecting the PDF parser."""
+
+    def test_unknown_backend_rejected(self, tmp_path: Path):
+        with pytest.raises(ValueError, match="Unknown PDF backend"):
+            DocumentLoader(tmp_path, pdf_backend="pdfminer")
+
+    def test_missing_backend_package_rejected(self, tmp_path: Path):
+        with patch("ingestion.loader.importlib.util.find_spec", return_value=None):
+            with pytest.raises(ValueError, match="requires the pymupdf package"):
+                DocumentLoader(tmp_path, pdf_backend="pymupdf")
+
+    def test_default_backend_does_not_require_pypdf2(self, tmp_path: Path):
+        with patch("ingestion.loader.importlib.util.find_spec", return_value=None):
+            loader = DocumentLoader(tmp_path)
+
+        assert loader.pdf_backend == "pypdf2"
+
+    def test_native_backend_not_run_concurrently_by_prefetch(self, tmp_path: Path):
+        """Loader threads must not parse with PDFium/MuPDF at the same time."""
+        input_dir = tmp_path / "input"
+        input_dir.mkdir()
+        for i in range(4):
+            (input_dir / f"report-{i}.pdf").write_bytes(b"%PDF-1.4")
+
+        active = 0
+        peak = 0
+        counter_lock = threading.Lock()
+
+        def fake_open(path):
+            nonlocal active, peak
+            with counter_lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with counter_lock:
+                active -= 1
+            page = MagicMock()
+            page.get_text.return_value = f"Text of {Path(path).stem}"
+            pdf = MagicMock(
+                metadata={}, page_count=1, is_encrypted=False, needs_pass=False
+            )
+            pdf.__iter__.return_value = iter([page])
+            return pdf
+
+        config = PipelineConfig(
+            input_dir=input_dir,
+            output_dir=tmp_path / "output",
+            pdf_backend="pymupdf",
+        )
+        with patch.dict(sys.modules, {"pymupdf": MagicMock(open=fake_open)}), \
+                patch("ingestion.loader.importlib.util.find_spec", return_value=object()):
+            result = IngestionPipeline(config).run()
+
+        assert result.processed == 4
+        assert peak == 1
+
+    def test_selected_backend_loads_pdfs(self, tmp_path: Path):
+        pdf_path = tmp_path / "report.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4")
+        handler = MagicMock(return_value=("[PAGE:1]\nFast text", {"page_count": 1}))
+
+        with patch("ingestion.loader.importlib.util.find_spec", return_value=object()), \
+                patch.dict(PDF_BACKENDS, {"pymupdf": (handler, "pymupdf")}):
+            document, _ = DocumentLoader(tmp_path, pdf_backend="pymupdf").load(pdf_path)
+
+        handler.assert_called_once_with(pdf_path)
+        assert "Fast text" in document.text
+        assert document.metadata["page_count"] == 1
+
+    def test_pdf_info_metadata_maps_keys_and_dates(self, tmp_path: Path):
+        metadata = _pdf_info_metadata(
+            tmp_path / "report.pdf",
+            {"Author": "Jane", "CreationDate": "D:20240115103000", "Title": ""},
+        )
+
+        assert metadata == {
+            "author": "Jane",
+            "creation_date": "2024-01-15T10:30:00",
+            "title": "report",
+        }
+
+
 class TestDOCXLoader:
     """Tests for DOCX parser functionality."""
 
@@ -431,6 +527,83 @@ author: John Doe
         assert "File read error" in str(exc_info.value)
 
 
+class TestDiscoverDocuments:
+    """Tests for document discovery."""
+
+    def test_discovers_supported_files_recursively(self, tmp_path: Path):
+        """Test that nested supported files are found, sorted, and others ignored."""
+        (tmp_path / "b").mkdir()
+        (tmp_path / "a" / "nested").mkdir(parents=True)
+        (tmp_path / "b" / "doc.md").write_text("# B")
+        (tmp_path / "a" / "nested" / "report.pdf").write_bytes(b"%PDF")
+        (tmp_path / "a" / "notes.txt").write_text("Notes")
+        (tmp_path / "a" / "script.py").write_text("print()")
+
+        assert discover_documents(tmp_path) == (
+            tmp_path / "a" / "nested" / "report.pdf",
+            tmp_path / "a" / "notes.txt",
+            tmp_path / "b" / "doc.md",
+        )
+
+    def test_picks_up_files_added_to_cached_directory(self, tmp_path: Path):
+        """Test that a repeated discovery sees files added since the last one."""
+        docs_dir = tmp_path / "docs"
+        docs_dir.mkdir()
+        (docs_dir / "first.md").write_text("# First")
+        # Age the directory so its listing is cached
+        os.utime(docs_dir, (0, 0))
+        assert discover_documents(tmp_path) == (docs_dir / "first.md",)
+
+        (docs_dir / "second.md").write_text("# Second")
+        assert discover_documents(tmp_path) == (
+            docs_dir / "first.md",
+            docs_dir / "second.md",
+        )
+
+    def test_cached_listing_is_per_suffix_set(self, tmp_path: Path):
+        """Test that a listing cached for some suffixes is not reused for others."""
+        (tmp_path / "notes.txt").write_text("Notes")
+        (tmp_path / "doc.md").write_text("# Doc")
+        os.utime(tmp_path, (0, 0))
+        directory = str(tmp_path)
+
+        assert _list_directory(directory, (".txt",))[0] == (str(tmp_path / "notes.txt"),)
+        assert _list_directory(directory, (".md",))[0] == (str(tmp_path / "doc.md"),)
+
+    def test_listing_cache_is_bounded(self, tmp_path: Path):
+        """Test that the least recently used listings are evicted."""
+        directories = []
+        for name in ("a", "b", "c"):
+            directory = tmp_path / name
+            directory.mkdir()
+            os.utime(directory, (0, 0))
+            directories.append(str(directory))
+
+        with patch("ingestion.loader._DIRECTORY_LISTINGS_MAX", 2), patch(
+            "ingestion.loader._DIRECTORY_LISTINGS", OrderedDict()
+        ) as listings:
+            for directory in directories:
+                _list_directory(directory, (".md",))
+            assert list(listings) == [(directory, (".md",)) for directory in directories[1:]]
+
+
+class TestHashFile:
+    """Tests for content hashing."""
+
+    def test_hash_file_matches_sha256(self, tmp_path: Path):
+        """Test that the file hash is the SHA-256 of its bytes."""
+        data = os.urandom(100_000)
+        path = tmp_path / "doc.pdf"
+        path.write_bytes(data)
+        assert hash_file(path) == hashlib.sha256(data).hexdigest()
+
+    def test_hash_file_empty(self, tmp_path: Path):
+        """Test that an empty file hashes without error."""
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+        assert hash_file(path) == hashlib.sha256(b"").hexdigest()
+
+
 class TestErrorHandling:
     """Tests for error handling across all loaders."""
 
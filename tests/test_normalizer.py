@@ -239,6 +239,20 @@ class TestBoilerplateRemoval:
         assert "CONFIDENTIAL" not in result.text
         assert "confidential" not in result.text
 
+    def test_optional_separators(self):
+        """Test boilerplate lines with and without optional separators."""
+        normalizer = TextNormalizer(NormalizationConfig(remove_boilerplate=True))
+        text = "Content\nDisclaimer :\nCopyright (c) 2024 Acme\nCopyright  2024\nEnd"
+        result = normalizer.normalize(text)
+        assert result.text == "Content\nEnd"
+
+    def test_long_whitespace_line_is_kept(self):
+        """Test that a near-miss line padded with whitespace is kept."""
+        normalizer = TextNormalizer(NormalizationConfig(remove_boilerplate=True))
+        text = "Content\ncopyright" + " " * 20000 + "notice\nEnd"
+        result = normalizer.normalize(text)
+        assert "copyright notice" in result.text
+
 
 class TestSpecialCharNormalization:
     """Tests for special character normalization."""
@@ -292,6 +306,20 @@ class TestSpecialCharNormalization:
         result = normalizer.normalize(text)
         assert "\u201c" in result.text
 
+    def test_custom_replacement_overrides_special_char(self):
+        """Test that a custom replacement takes precedence over the built-in map."""
+        normalizer = TextNormalizer(
+            NormalizationConfig(
+                normalize_special_chars=True,
+                custom_replacements={"\u201c": "<<"},
+            )
+        )
+        text = "\u201cHello\u201d"
+        result = normalizer.normalize(text)
+        assert result.text == '<<Hello"'
+        assert result.removed_patterns["special_chars"] == 1
+        assert result.removed_patterns["custom_replacements"] == 1
+
 
 class TestBulletNormalization:
     """Tests for bullet character normalization."""
@@ -462,6 +490,13 @@ class TestCodeBlockPreservation:
         # Note: The code block markers will still be present
         assert "Code with spaces" in result.text
 
+    def test_placeholder_like_text_is_untouched(self):
+        """Test that text resembling a placeholder is not replaced by a code block."""
+        normalizer = TextNormalizer(NormalizationConfig(preserve_code_blocks=True))
+        text = "See __CODE_BLOCK_0__ here\n```\nx  =  1\n```"
+        result = normalizer.normalize(text)
+        assert result.text == "See __CODE_BLOCK_0__ here\n```\nx  =  1\n```"
+
 
 class TestConfigurationPresets:
     """Tests for configuration presets."""
@@ -509,6 +544,14 @@ class TestConfigurationPresets:
         assert "Confidential" not in result.text
         assert "Page 1" not in result.text
 
+    def test_precompile_then_normalize(self):
+        """Test that precompiled configurations normalize as usual."""
+        config = NormalizationConfig(custom_patterns=[r"^\s*REF:\s*\d+\s*$"])
+        TextNormalizer.precompile([config, NormalizationConfig()])
+
+        result = TextNormalizer(config).normalize("Content\nREF: 42\nPage 1")
+        assert result.text == "Content"
+
 
 class TestCustomPatterns:
     """Tests for custom pattern support."""
@@ -538,6 +581,34 @@ class TestCustomPatterns:
         assert "ID: ABC123" not in result.text
         assert "DATE: 2024-01-15" not in result.text
 
+    def test_custom_patterns_with_backreferences(self):
+        """Test that patterns using group references keep their meaning."""
+        config = NormalizationConfig(
+            custom_patterns=[
+                r"^(\w+) \1$",
+                r"(?i)^\s*internal memo\s*$",
+            ]
+        )
+        normalizer = TextNormalizer(config)
+        text = "Content\nbye bye\nhello world\nINTERNAL MEMO\nMore content"
+        result = normalizer.normalize(text)
+        assert result.text == "Content\nhello world\nMore content"
+        assert result.removed_patterns["custom_patterns"] == 2
+
+    def test_custom_patterns_with_verbose_comment(self):
+        """Test that a trailing comment in a verbose pattern does not break combining."""
+        config = NormalizationConfig(
+            custom_patterns=[
+                r"(?x)^REF\d+$ # reference ids",
+                r"^FOO$",
+            ]
+        )
+        normalizer = TextNormalizer(config)
+        text = "Content\nREF12\nFOO\nMore content"
+        result = normalizer.normalize(text)
+        assert result.text == "Content\nMore content"
+        assert result.removed_patterns["custom_patterns"] == 2
+
 
 class TestCustomReplacements:
     """Tests for custom character replacements."""
@@ -563,6 +634,16 @@ class TestCustomReplacements:
         result = normalizer.normalize(text)
         assert result.removed_patterns.get("custom_replacements", 0) == 3
 
+    def test_custom_replacement_longest_match(self):
+        """Test that overlapping keys prefer the longest match and are not re-applied."""
+        config = NormalizationConfig(
+            custom_replacements={"X": "XX", "XX": "X"}
+        )
+        normalizer = TextNormalizer(config)
+        result = normalizer.normalize("XX and X")
+        assert result.text == "X and XX"
+        assert result.removed_patterns.get("custom_replacements", 0) == 2
+
 
 class TestYAMLConfiguration:
     """Tests for YAML configuration loading."""
@@ -651,6 +732,20 @@ class TestNormalizationResult:
 
         assert result.removed_patterns.get("page_numbers", 0) == 3
 
+    def test_result_without_stats(self):
+        """Test that disabling stats keeps the text but skips rule bookkeeping."""
+        text = "\u201cContent\u201d\nPage 1\n\u2022 Item   one\nXX"
+        config = NormalizationConfig(custom_replacements={"XX": "YY"})
+        with_stats = TextNormalizer(config).normalize(text)
+
+        config.collect_stats = False
+        result = TextNormalizer(config).normalize(text)
+
+        assert result.text == with_stats.text
+        assert result.normalized_length == with_stats.normalized_length
+        assert result.rules_applied == []
+        assert result.removed_patterns == {}
+
 
 class TestDocumentLoaderIntegration:
     """Tests for integration with DocumentLoader."""
@@ -0,0 +1,191 @@
+"""Unit tests for the resident query daemon."""
+from __future__ import annotations
+
+import importlib.util
+import socket
+import socketserver
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from indexing.query_daemon import (
+    QueryDaemon,
+    QueryDaemonError,
+    QueryDaemonServer,
+    query_daemon,
+)
+
+
+@pytest.fixture
+def running_daemon():
+    """Serve a QueryDaemon backed by a fake collection and embedding function."""
+    collection = MagicMock()
+    collection.query.return_value = {
+        "ids": [["doc-1-chunk-0000"]],
+        "documents": [["Chunk text"]],
+        "metadatas": [[{"doc_id": "doc-1"}]],
+        "distances": [[0.25]],
+    }
+    embedding_fn = MagicMock(return_value=[[0.1, 0.2, 0.3]])
+    # Unix socket paths are length-limited, so avoid pytest's deep tmp_path.
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        service = QueryDaemon(
+            collection,
+            embedding_fn,
+            "pilot-docs",
+            vectorstore_dir=Path(tmp_dir) / "vectorstore",
+            embedding_model="sentence-transformers/all-MiniLM-L6-v2",
+            embedding_backend="torch",
+        )
+        socket_path = Path(tmp_dir) / "daemon.sock"
+        server = QueryDaemonServer(socket_path, service)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield socket_path, collection, embedding_fn
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+
+class TestQueryDaemon:
+    """Tests for daemon request handling over the unix socket."""
+
+    def test_query_uses_precomputed_embedding(self, running_daemon):
+        socket_path, collection, embedding_fn = running_daemon
+
+        result = query_daemon(socket_path, "What is it?", 2, collection_name="pilot-docs")
+
+        assert result == {
+            "ids": ["doc-1-chunk-0000"],
+            "documents": ["Chunk text"],
+            "metadatas": [{"doc_id": "doc-1"}],
+            "distances": [0.25],
+        }
+        embedding_fn.assert_called_once_with(["What is it?"])
+        collection.query.assert_called_once_with(
+            query_embeddings=[[0.1, 0.2, 0.3]],
+            n_results=2,
+            include=["documents", "metadatas", "distances"],
+        )
+
+    def test_model_is_reused_across_requests(self, running_daemon):
+        socket_path, collection, embedding_fn = running_daemon
+
+        query_daemon(socket_path, "first", 1)
+        query_daemon(socket_path, "second", 1)
+
+        assert embedding_fn.call_count == 2
+        assert collection.query.call_count == 2
+
+    def test_rejects_other_collection(self, running_daemon):
+        socket_path, collection, _ = running_daemon
+
+        with pytest.raises(QueryDaemonError, match="pilot-docs"):
+            query_daemon(socket_path, "question", 1, collection_name="other")
+        collection.query.assert_not_called()
+
+    def test_accepts_matching_store_and_model(self, running_daemon):
+        socket_path, collection, _ = running_daemon
+
+        query_daemon(
+            socket_path,
+            "question",
+            1,
+            vectorstore_dir=socket_path.parent / "vectorstore",
+            embedding_model="sentence-transformers/all-MiniLM-L6-v2",
+            embedding_backend="torch",
+        )
+
+        collection.query.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "override, served",
+        [
+            ({"vectorstore_dir": Path("other/vectorstore")}, "vector store"),
+            ({"embedding_model": "BAAI/bge-small-en-v1.5"}, "embedding model"),
+            ({"embedding_backend": "onnx"}, "embedding backend"),
+        ],
+    )
+    def test_rejects_other_store_or_model(self, running_daemon, override, served):
+        socket_path, collection, embedding_fn = running_daemon
+
+        with pytest.raises(QueryDaemonError, match=f"Daemon serves {served}"):
+            query_daemon(socket_path, "question", 1, **override)
+        embedding_fn.assert_not_called()
+        collection.query.assert_not_called()
+
+    def test_unreachable_daemon_raises(self, tmp_path: Path):
+        with pytest.raises(QueryDaemonError, match="unavailable"):
+            query_daemon(tmp_path / "missing.sock", "question", 1)
+
+
+class TestQueryDaemonSocket:
+    """Tests for claiming and releasing the daemon socket path."""
+
+    def test_refuses_to_replace_regular_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "daemon.sock"
+            path.write_text("not a socket")
+            with pytest.raises(QueryDaemonError, match="not a unix socket"):
+                QueryDaemonServer(path, MagicMock())
+            assert path.read_text() == "not a socket"
+
+    def test_refuses_socket_of_running_daemon(self, running_daemon):
+        socket_path, _, _ = running_daemon
+        with pytest.raises(QueryDaemonError, match="already listening"):
+            QueryDaemonServer(socket_path, MagicMock())
+        assert socket_path.exists()
+
+    def test_replaces_stale_socket(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "daemon.sock"
+            stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            stale.bind(str(path))
+            stale.close()
+            server = QueryDaemonServer(path, MagicMock())
+            server.server_close()
+            assert not path.exists()
+
+    def test_close_keeps_socket_bound_by_another_server(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "daemon.sock"
+            first = QueryDaemonServer(path, MagicMock())
+            first.socket.close()
+            second = QueryDaemonServer(path, MagicMock())
+            try:
+                first.server_close()
+                assert path.exists()
+            finally:
+                second.server_close()
+            assert not path.exists()
+
+
+class TestQueryDaemonWithoutUnixSockets:
+    """Tests for platforms such as Windows that lack AF_UNIX."""
+
+    @pytest.fixture
+    def module_without_unix_sockets(self, monkeypatch):
+        import indexing.query_daemon as installed
+
+        monkeypatch.delattr(socket, "AF_UNIX")
+        monkeypatch.delattr(socketserver, "UnixStreamServer")
+        # Load a separate copy so the installed module keeps its classes
+        spec = importlib.util.spec_from_file_location(
+            "indexing._query_daemon_without_unix_sockets", installed.__file__
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def test_module_imports_without_server(self, module_without_unix_sockets):
+        assert module_without_unix_sockets.DAEMON_SUPPORTED is False
+        assert not hasattr(module_without_unix_sockets, "QueryDaemonServer")
+
+    def test_query_raises_daemon_error(self, module_without_unix_sockets):
+        with pytest.raises(module_without_unix_sockets.QueryDaemonError, match="unix sockets"):
+            module_without_unix_sockets.query_daemon("daemon.sock", "question", 1)
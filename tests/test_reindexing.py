@@ -161,6 +161,39 @@ class TestUpsertOperation:
             # Should delete before upsert to ensure clean state
             mock_collection.delete.assert_called()
 
+    def test_embeds_once_per_encode_batch_and_upserts_in_batches(self):
+        """Embedding covers up to encode_batch_size chunks; upserts use batch_size."""
+        config = IndexingConfig(
+            processed_dir=Path("processed"),
+            chroma_dir=Path("chroma"),
+            batch_size=2,
+            encode_batch_size=4,
+        )
+        records = [
+            ChunkRecord(f"doc::chunk-{i:04d}", "doc", i, f"Chunk {i}", {"doc_id": "doc"})
+            for i in range(5)
+        ]
+
+        pipeline = ChromaIndexingPipeline.__new__(ChromaIndexingPipeline)
+        pipeline.config = config
+        pipeline.collection = MagicMock()
+        pipeline.embedding_service = MagicMock()
+        pipeline.embedding_service.embed_batch.side_effect = (
+            lambda texts: [[float(len(text))] for text in texts]
+        )
+
+        assert pipeline._upsert_records(records) == (5, 0)
+
+        embed_calls = pipeline.embedding_service.embed_batch.call_args_list
+        assert [len(call.args[0]) for call in embed_calls] == [4, 1]
+        upsert_calls = pipeline.collection.upsert.call_args_list
+        assert [call.kwargs["ids"] for call in upsert_calls] == [
+            ["doc::chunk-0000", "doc::chunk-0001"],
+            ["doc::chunk-0002", "doc::chunk-0003"],
+            ["doc::chunk-0004"],
+        ]
+        assert upsert_calls[1].kwargs["embeddings"] == [[7.0], [7.0]]
+
 
 class TestOrphanedChunkRemoval:
     """Test that orphaned chunks are removed when source changes."""
@@ -391,3 +424,228 @@ class TestSelectiveReindex:
 
             # Delete should only be called for doc1
             mock_collection.delete.assert_called_once_with(where={"doc_id": "doc1"})
+
+    def test_reindex_all_docs_counts_each_document(self, tmp_path: Path):
+        """Writes for every document are awaited, including upsert failures."""
+        processed_dir = tmp_path / "processed"
+        chunks_dir = processed_dir / "chunks"
+        chunks_dir.mkdir(parents=True)
+
+        manifest = {
+            doc_id: {"source_path": f"/{doc_id}.pdf", "content_hash": doc_id}
+            for doc_id in ["doc1", "doc2", "doc3"]
+        }
+        (processed_dir / "manifest.json").write_text(json.dumps(manifest))
+        for doc_id in manifest:
+            chunk_data = {
+                "doc_id": doc_id,
+                "chunk_id": f"{doc_id}::chunk-0000",
+                "chunk_index": 0,
+                "text": f"Content for {doc_id}",
+            }
+            (chunks_dir / f"{doc_id}.jsonl").write_text(json.dumps(chunk_data) + "\n")
+
+        config = IndexingConfig(
+            processed_dir=processed_dir,
+            chroma_dir=tmp_path / "chroma",
+            collection_name="test-all",
+        )
+
+        pipeline = ChromaIndexingPipeline.__new__(ChromaIndexingPipeline)
+        pipeline.config = config
+        pipeline.manifest_path = processed_dir / "manifest.json"
+        pipeline.chunks_dir = chunks_dir
+
+        calls = []
+        mock_collection = MagicMock()
+        mock_collection.delete.side_effect = lambda where: calls.append(("delete", where["doc_id"]))
+
+        def upsert(ids, **kwargs):
+            calls.append(("upsert", ids[0]))
+            if ids[0].startswith("doc2"):
+                raise RuntimeError("disk full")
+
+        mock_collection.upsert.side_effect = upsert
+        pipeline.collection = mock_collection
+
+        mock_embed_service = MagicMock()
+        mock_embed_service.embed_batch.return_value = [[0.1] * 384]
+        pipeline.embedding_service = mock_embed_service
+
+        result = pipeline.run()
+
+        assert result.indexed_docs == 3
+        assert result.indexed_chunks == 2
+        assert result.failed_chunks == 1
+        # Each document is deleted before its chunks are upserted
+        assert calls == [
+            ("delete", "doc1"),
+            ("upsert", "doc1::chunk-0000"),
+            ("delete", "doc2"),
+            ("upsert", "doc2::chunk-0000"),
+            ("delete", "doc3"),
+            ("upsert", "doc3::chunk-0000"),
+        ]
+
+
+class TestChunkChangeDetection:
+    """Test that only chunks whose text changed are re-embedded."""
+
+    @staticmethod
+    def _write_doc(processed_dir: Path, texts: List[str], timestamp: str) -> None:
+        manifest = {
+            "doc1": {
+                "source_path": "/doc1.md",
+                "content_hash": timestamp,
+                "metadata": {"ingestion_timestamp": timestamp},
+            }
+        }
+        (processed_dir / "manifest.json").write_text(json.dumps(manifest))
+        lines = [
+            json.dumps({
+                "doc_id": "doc1",
+                "chunk_id": f"doc1::chunk-{i:04d}",
+                "chunk_index": i,
+                "text": text,
+            })
+            for i, text in enumerate(texts)
+        ]
+        (processed_dir / "chunks" / "doc1.jsonl").write_text("\n".join(lines) + "\n")
+
+    @staticmethod
+    def _pipeline(tmp_path: Path, force_reembed: bool = False) -> ChromaIndexingPipeline:
+        from indexing.chroma_store import get_collection
+
+        config = IndexingConfig(
+            processed_dir=tmp_path / "processed",
+            chroma_dir=tmp_path / "chroma",
+            collection_name="test-cdc",
+            force_reembed=force_reembed,
+        )
+        pipeline = ChromaIndexingPipeline.__new__(ChromaIndexingPipeline)
+        pipeline.config = config
+        pipeline.manifest_path = config.processed_dir / "manifest.json"
+        pipeline.chunks_dir = config.processed_dir / "chunks"
+        pipeline.collection = get_collection(
+            config.chroma_dir, config.collection_name, embedding_function=None
+        )
+        pipeline.embedding_service = MagicMock()
+        pipeline.embedding_service.embed_batch.side_effect = (
+            lambda texts: [[float(len(text)), 1.0] for text in texts]
+        )
+        return pipeline
+
+    def test_reembeds_only_changed_chunks(self, tmp_path: Path):
+        processed_dir = tmp_path / "processed"
+        (processed_dir / "chunks").mkdir(parents=True)
+        self._write_doc(processed_dir, ["alpha", "beta", "gamma"], "t1")
+        first = self._pipeline(tmp_path).run()
+        assert (first.indexed_chunks, first.reused_chunks) == (3, 0)
+
+        # Edit the second chunk and drop the third
+        self._write_doc(processed_dir, ["alpha", "beta edited"], "t1")
+        pipeline = self._pipeline(tmp_path)
+        result = pipeline.run()
+
+        embedded = [
+            text
+            for call in pipeline.embedding_service.embed_batch.call_args_list
+            for text in call.args[0]
+        ]
+        assert embedded == ["beta edited"]
+        assert (result.indexed_chunks, result.reused_chunks) == (2, 1)
+        stored = pipeline.collection.get(include=["documents"])
+        assert sorted(stored["documents"]) == ["alpha", "beta edited"]
+
+    def test_metadata_change_keeps_stored_embedding(self, tmp_path: Path):
+        processed_dir = tmp_path / "processed"
+        (processed_dir / "chunks").mkdir(parents=True)
+        self._write_doc(processed_dir, ["alpha"], "t1")
+        self._pipeline(tmp_path).run()
+
+        self._write_doc(processed_dir, ["alpha"], "t2")
+        pipeline = self._pipeline(tmp_path)
+        result = pipeline.run()
+
+        pipeline.embedding_service.embed_batch.assert_not_called()
+        assert result.reused_chunks == 1
+        stored = pipeline.collection.get(include=["metadatas", "embeddings"])
+        assert stored["metadatas"][0]["timestamp"] == "t2"
+        assert list(stored["embeddings"][0]) == [5.0, 1.0]
+
+    def test_metadata_change_reembeds_when_embedding_read_fails(self, tmp_path: Path):
+        processed_dir = tmp_path / "processed"
+        (processed_dir / "chunks").mkdir(parents=True)
+        self._write_doc(processed_dir, ["alpha"], "t1")
+        self._pipeline(tmp_path).run()
+
+        self._write_doc(processed_dir, ["alpha"], "t2")
+        pipeline = self._pipeline(tmp_path)
+        collection_get = pipeline.collection.get
+
+        def get(*args, **kwargs):
+            if kwargs.get("include") == ["embeddings"]:
+                raise RuntimeError("transient read error")
+            return collection_get(*args, **kwargs)
+
+        with patch.object(pipeline.collection, "get", side_effect=get):
+            result = pipeline.run()
+
+        pipeline.embedding_service.embed_batch.assert_called_once_with(["alpha"])
+        assert (result.indexed_chunks, result.failed_chunks, result.reused_chunks) == (1, 0, 0)
+        stored = pipeline.collection.get(include=["metadatas"])
+        assert stored["metadatas"][0]["timestamp"] == "t2"
+
+    def test_force_reembed_embeds_everything(self, tmp_path: Path):
+        processed_dir = tmp_path / "processed"
+        (processed_dir / "chunks").mkdir(parents=True)
+        self._write_doc(processed_dir, ["alpha", "beta"], "t1")
+        self._pipeline(tmp_path).run()
+
+        pipeline = self._pipeline(tmp_path, force_reembed=True)
+        result = pipeline.run()
+
+        assert pipeline.embedding_service.embed_batch.call_count == 1
+        assert (result.indexed_chunks, result.reused_chunks) == (2, 0)
+
+    def test_backend_switch_reembeds_unchanged_text(self, tmp_path: Path):
+        processed_dir = tmp_path / "processed"
+        (processed_dir / "chunks").mkdir(parents=True)
+        self._write_doc(processed_dir, ["alpha", "beta"], "t1")
+        self._pipeline(tmp_path).run()
+
+        pipeline = self._pipeline(tmp_path)
+        pipeline.config.embedding_backend = "onnx-int8"
+        result = pipeline.run()
+
+        assert pipeline.embedding_service.embed_batch.call_count == 1
+        assert (result.indexed_chunks, result.reused_chunks) == (2, 0)
+
+    def test_stored_chunks_fetched_per_group_of_documents(self, tmp_path: Path):
+        processed_dir = tmp_path / "processed"
+        chunks_dir = processed_dir / "chunks"
+        chunks_dir.mkdir(parents=True)
+        doc_ids = ["doc1", "doc2", "doc3"]
+        manifest = {doc_id: {"source_path": f"/{doc_id}.md"} for doc_id in doc_ids}
+        (processed_dir / "manifest.json").write_text(json.dumps(manifest))
+        for doc_id in doc_ids:
+            chunk_data = {
+                "doc_id": doc_id,
+                "chunk_id": f"{doc_id}::chunk-0000",
+                "chunk_index": 0,
+                "text": f"Content for {doc_id}",
+            }
+            (chunks_dir / f"{doc_id}.jsonl").write_text(json.dumps(chunk_data) + "\n")
+
+        pipeline = self._pipeline(tmp_path)
+        pipeline.collection = MagicMock()
+        pipeline.collection.get.return_value = {"ids": [], "metadatas": []}
+
+        with patch("indexing.pipeline.STORED_LOOKUP_DOCS", 2):
+            result = pipeline.run()
+
+        assert result.indexed_docs == 3
+        assert [call.kwargs["where"] for call in pipeline.collection.get.call_args_list] == [
+            {"doc_id": {"$in": ["doc1", "doc2"]}},
+            {"doc_id": {"$in": ["doc3"]}},
+        ]